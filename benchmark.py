@@ -0,0 +1,315 @@
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import argparse
+import platform
+import tempfile
+import statistics
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+# 화면 없이 실행할 수 있도록 Qt를 불러오기 전에 offscreen 플랫폼 지정
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+# 가져오기, 목록 조회, 미리보기, 슬라이드쇼의 성능 측정
+# 예) python benchmark.py --sizes 1000 10000 --output after.json --compare before.json
+
+DEFAULT_SIZES = (1000, 10000, 100000)
+DEFAULT_IMAGE_SIZE = (1600, 1200)
+CATEGORIES = ('가족', '여행', '음식', '풍경', '기타')
+CAMERAS = ('Canon EOS R5', 'NIKON Z 6', 'SONY ILCE-7M3', 'iPhone 14 Pro')
+PREVIEW_SIZE = (400, 400)
+SLIDESHOW_FRAME_TIMEOUT = 10  # 한 장을 기다리는 최대 시간(초)
+
+
+def summarize(samples):
+    # 밀리초 단위 측정값의 요약 (비교할 때는 median_ms를 기준으로 사용)
+    samples = sorted(samples)
+    if not samples:
+        return {'count': 0}
+    p95_index = min(len(samples) - 1, int(round(len(samples) * 0.95)) - 1)
+    return {
+        'count': len(samples),
+        'mean_ms': round(statistics.fmean(samples), 3),
+        'median_ms': round(statistics.median(samples), 3),
+        'p95_ms': round(samples[max(0, p95_index)], 3),
+        'min_ms': round(samples[0], 3),
+        'max_ms': round(samples[-1], 3),
+    }
+
+
+def _generate_image(task):
+    # 같은 내용이 없도록 사진마다 다른 시드로 색 블록과 EXIF(촬영 일시, 카메라)를 만듦
+    from PIL import Image, ImageDraw
+
+    index, file_path, width, height = task
+    rng = random.Random(index)
+    image = Image.new('RGB', (width, height), tuple(rng.randrange(256) for _ in range(3)))
+    draw = ImageDraw.Draw(image)
+    for _ in range(24):
+        x, y = rng.randrange(width), rng.randrange(height)
+        draw.rectangle((x, y, x + rng.randrange(width // 2), y + rng.randrange(height // 2)),
+                       fill=tuple(rng.randrange(256) for _ in range(3)))
+    exif = Image.Exif()
+    exif[0x0110] = CAMERAS[index % len(CAMERAS)]
+    exif[0x0132] = f"20{10 + index % 14:02d}:{1 + index % 12:02d}:{1 + index % 28:02d} 12:00:00"
+    image.save(file_path, 'JPEG', quality=85, exif=exif.tobytes())
+
+
+def generate_library(root, count, image_size=DEFAULT_IMAGE_SIZE):
+    # 사진 count장을 카테고리 폴더에 나누어 만듦, 이미 만든 라이브러리는 다시 사용
+    library_dir = os.path.join(root, f"library_{count}_{image_size[0]}x{image_size[1]}")
+    marker = os.path.join(library_dir, '.complete')
+    if os.path.exists(marker):
+        return library_dir
+
+    tasks = []
+    for index in range(count):
+        category_dir = os.path.join(library_dir, CATEGORIES[index % len(CATEGORIES)])
+        tasks.append((index, os.path.join(category_dir, f"IMG_{index:06d}.jpg"), *image_size))
+    for category in CATEGORIES:
+        os.makedirs(os.path.join(library_dir, category), exist_ok=True)
+
+    started = time.perf_counter()
+    with ProcessPoolExecutor() as executor:
+        for _ in executor.map(_generate_image, tasks, chunksize=max(1, count // 256)):
+            pass
+    open(marker, 'w').close()
+    print(f"사진 {count}장 생성: {time.perf_counter() - started:.1f}초", file=sys.stderr)
+    return library_dir
+
+
+def bench_import(db_path, library_dir):
+    # 가져오기 스레드와 같은 순서: 해시/중복 검사 -> 일괄 추가 -> EXIF 메타데이터
+    from database import Database
+    from file_handler import FileHandler
+    from dedupe import iter_new_photos
+    from metadata import extract_missing_metadata
+
+    db = Database(db_path)
+    db.connect()
+    try:
+        started = time.perf_counter()
+        for category in CATEGORIES:
+            db.add_category(category)
+            photos = iter_new_photos(db, FileHandler.iter_photo_files([os.path.join(library_dir, category)]))
+            db.add_photos(photos, category)
+        insert_seconds = time.perf_counter() - started
+        # 처리량은 add_photos의 반환값 대신 실제로 저장된 행 수로 계산
+        added = db.conn.execute("SELECT COUNT(*) FROM photos").fetchone()[0]
+
+        started = time.perf_counter()
+        extracted = extract_missing_metadata(db)
+        metadata_seconds = time.perf_counter() - started
+    finally:
+        db.close()
+    return {
+        'photos': added,
+        'seconds': round(insert_seconds, 3),
+        'photos_per_sec': round(added / insert_seconds, 1) if insert_seconds else None,
+        'metadata_photos': extracted,
+        'metadata_seconds': round(metadata_seconds, 3),
+        'metadata_photos_per_sec': round(extracted / metadata_seconds, 1) if metadata_seconds else None,
+    }
+
+
+def bench_queries(db_path, repeat):
+    from database import Database
+
+    db = Database(db_path)
+    db.connect()
+    try:
+        results = {}
+        category_samples, page_samples, search_samples = [], [], []
+        for _ in range(repeat):
+            for category in CATEGORIES:
+                started = time.perf_counter()
+                db.get_photos_by_category(category)
+                category_samples.append((time.perf_counter() - started) * 1000)
+
+                started = time.perf_counter()
+                db.get_photos_page(category, 0, 500)
+                page_samples.append((time.perf_counter() - started) * 1000)
+
+            started = time.perf_counter()
+            db.search_photos('IMG_0001', None, 0, 500)
+            search_samples.append((time.perf_counter() - started) * 1000)
+        results['get_photos_by_category'] = summarize(category_samples)
+        results['get_photos_page'] = summarize(page_samples)
+        results['search_photos'] = summarize(search_samples)
+    finally:
+        db.close()
+    return results
+
+
+def _sample_paths(library_dir, limit):
+    paths = []
+    for category in CATEGORIES:
+        category_dir = os.path.join(library_dir, category)
+        paths.extend(os.path.join(category_dir, name) for name in sorted(os.listdir(category_dir)))
+    rng = random.Random(0)
+    return rng.sample(paths, min(limit, len(paths)))
+
+
+def _qt_application():
+    from PyQt5.QtWidgets import QApplication
+
+    return QApplication.instance() or QApplication([sys.argv[0]])
+
+
+def bench_preview(library_dir, work_dir, samples):
+    # 미리보기 경로: 원본 축소 디코딩, 썸네일 생성(캐시 없음), 썸네일 재사용(캐시 있음)
+    from file_handler import FileHandler
+    from thumbnail_cache import ThumbnailCache
+
+    _qt_application()
+    paths = _sample_paths(library_dir, samples)
+    width, height = PREVIEW_SIZE
+    cache_dir = os.path.join(work_dir, 'thumbnails')
+    shutil.rmtree(cache_dir, ignore_errors=True)
+    cache = ThumbnailCache(cache_dir)
+
+    results = {}
+    for name, load in (('scaled_decode', lambda path: FileHandler.load_scaled_photo(path, width, height)),
+                       ('thumbnail_cold', lambda path: FileHandler.load_preview(path, width, height, cache)),
+                       ('thumbnail_warm', lambda path: FileHandler.load_preview(path, width, height, cache))):
+        timings = []
+        for path in paths:
+            started = time.perf_counter()
+            load(path)
+            timings.append((time.perf_counter() - started) * 1000)
+        results[name] = summarize(timings)
+    shutil.rmtree(cache_dir, ignore_errors=True)
+    return results
+
+
+def bench_slideshow(library_dir, samples, interval):
+    # 다음 사진으로 넘긴 순간부터 해당 사진이 버퍼에 준비될 때까지의 시간
+    # interval은 사진 사이 대기 시간으로, 그동안 미리 읽기가 진행됨
+    from PyQt5.QtCore import QEventLoop
+    from slideshow import SlideShow
+
+    app = _qt_application()
+    paths = _sample_paths(library_dir, samples + 1)
+    slideshow = SlideShow(paths)
+    slideshow.timer.stop()
+
+    def wait_for_current():
+        deadline = time.perf_counter() + SLIDESHOW_FRAME_TIMEOUT
+        while slideshow.current_index not in slideshow.buffer and time.perf_counter() < deadline:
+            app.processEvents(QEventLoop.AllEvents, 5)
+
+    started = time.perf_counter()
+    wait_for_current()
+    first_frame = (time.perf_counter() - started) * 1000
+
+    timings = []
+    for _ in range(samples):
+        deadline = time.perf_counter() + interval
+        while time.perf_counter() < deadline:
+            app.processEvents(QEventLoop.AllEvents, 5)
+        started = time.perf_counter()
+        slideshow.next_image()
+        wait_for_current()
+        timings.append((time.perf_counter() - started) * 1000)
+    slideshow.close()
+    return {'first_frame_ms': round(first_frame, 3), 'next_frame': summarize(timings)}
+
+
+def run_benchmarks(args):
+    results = {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'image_size': list(args.image_size),
+        },
+        'results': {},
+    }
+    os.makedirs(args.work_dir, exist_ok=True)
+    for count in args.sizes:
+        library_dir = generate_library(args.work_dir, count, tuple(args.image_size))
+        db_path = os.path.join(args.work_dir, f"bench_{count}.db")
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(db_path + suffix):
+                os.remove(db_path + suffix)
+
+        size_results = {}
+        print(f"[{count}장] 가져오기", file=sys.stderr)
+        size_results['import'] = bench_import(db_path, library_dir)
+        print(f"[{count}장] 목록 조회", file=sys.stderr)
+        size_results['query'] = bench_queries(db_path, args.repeat)
+        if 'preview' not in args.skip:
+            print(f"[{count}장] 미리보기", file=sys.stderr)
+            size_results['preview'] = bench_preview(library_dir, args.work_dir, args.samples)
+        if 'slideshow' not in args.skip:
+            print(f"[{count}장] 슬라이드쇼", file=sys.stderr)
+            size_results['slideshow'] = bench_slideshow(library_dir, args.samples, args.slide_interval)
+        results['results'][str(count)] = size_results
+    return results
+
+
+def _flatten(results, prefix=''):
+    # 비교용으로 {'1000.query.get_photos_page.median_ms': 값} 형태로 펼침
+    values = {}
+    for key, value in results.items():
+        name = f"{prefix}.{key}" if prefix else key
+        if isinstance(value, dict):
+            values.update(_flatten(value, name))
+        elif isinstance(value, (int, float)) and key.endswith(('median_ms', 'p95_ms', 'per_sec', 'first_frame_ms')):
+            values[name] = value
+    return values
+
+
+def compare(baseline, current):
+    # 처리량(per_sec)은 클수록, 시간(_ms)은 작을수록 좋음
+    lines = []
+    old_values, new_values = _flatten(baseline['results']), _flatten(current['results'])
+    for name in sorted(set(old_values) & set(new_values)):
+        old, new = old_values[name], new_values[name]
+        if not old:
+            continue
+        change = (new - old) / old * 100
+        better = change > 0 if name.endswith('per_sec') else change < 0
+        mark = '개선' if better and abs(change) >= 5 else ('저하' if abs(change) >= 5 else '')
+        lines.append(f"{name:60} {old:>12.3f} -> {new:>12.3f} {change:+7.1f}% {mark}")
+    return '\n'.join(lines)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description='사진관리프로그램 성능 측정')
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES), help='라이브러리 크기(사진 수)')
+    parser.add_argument('--image-size', type=int, nargs=2, default=list(DEFAULT_IMAGE_SIZE), metavar=('W', 'H'))
+    parser.add_argument('--work-dir', default=os.path.join(tempfile.gettempdir(), 'photo_book_benchmark'),
+                        help='생성한 라이브러리와 데이터베이스를 둘 폴더 (다음 실행에서 재사용)')
+    parser.add_argument('--repeat', type=int, default=20, help='조회 반복 횟수')
+    parser.add_argument('--samples', type=int, default=50, help='미리보기/슬라이드쇼 측정 사진 수')
+    parser.add_argument('--slide-interval', type=float, default=0.2, help='슬라이드 사이 대기 시간(초)')
+    parser.add_argument('--skip', nargs='*', default=[], choices=['preview', 'slideshow'])
+    parser.add_argument('--output', help='결과를 저장할 JSON 파일')
+    parser.add_argument('--compare', help='비교할 이전 결과 JSON 파일')
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    results = run_benchmarks(args)
+    output = json.dumps(results, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output)
+    else:
+        print(output)
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            print(compare(json.load(f), results), file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    multiprocessing.freeze_support()
+    sys.exit(main())
@@ -0,0 +1,149 @@
+import os
+import sys
+import argparse
+import multiprocessing
+from config import DATABASE_PATH, NEAR_DUPLICATE_THRESHOLD, EXPORT_WORKERS, IMPORT_INTO_STORE, STORE_DIR_NAME
+
+# 명령줄 도구: Qt를 불러오지 않으므로 화면이 없는 서버나 예약 작업에서도 바로 실행됨
+# 예) python cli.py import 여행 D:/camera --create-category
+#     python cli.py rescan
+
+
+def format_size(num_bytes):
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if num_bytes < 1024:
+            return f"{num_bytes:.0f}{unit}" if unit == 'B' else f"{num_bytes:.1f}{unit}"
+        num_bytes /= 1024
+    return f"{num_bytes:.1f}TB"
+
+
+def command_import(db, args):
+    from file_handler import FileHandler
+    from dedupe import iter_new_photos
+    from metadata import extract_missing_metadata
+
+    if args.category not in db.get_categories():
+        if not args.create_category:
+            print(f"카테고리 '{args.category}'을(를) 찾을 수 없습니다. (--create-category로 생성 가능)")
+            return 1
+        db.add_category(args.category)
+
+    stats = {}
+    if IMPORT_INTO_STORE and not args.in_place:
+        from photo_store import PhotoStore, store_duplicate_policy
+
+        photos = iter_new_photos(db, FileHandler.iter_photo_files(args.paths), policy=store_duplicate_policy(), stats=stats)
+        photos = PhotoStore(os.path.join(os.path.dirname(os.path.abspath(args.db)), STORE_DIR_NAME)).ingest_all(photos)
+    else:
+        photos = iter_new_photos(db, FileHandler.iter_photo_files(args.paths), stats=stats)
+    added = db.add_photos(photos, args.category,
+                          progress_callback=lambda count: print(f"\r{count}장 추가됨", end='', file=sys.stderr))
+    print(file=sys.stderr)
+    extract_missing_metadata(db)
+    print(f"{added}장을 '{args.category}'에 추가했습니다. (중복 {stats.get('duplicates', 0)}장)")
+    return 0
+
+
+def command_rescan(db, args):
+    from scanner import LibraryScanner
+    from metadata import extract_missing_metadata
+
+    result = LibraryScanner(db).scan()
+    if result.added or result.changed:
+        extract_missing_metadata(db)
+    print(result)
+    return 0
+
+
+def command_export(db, args):
+    from exporter import export_photos
+
+    if args.category not in db.get_categories():
+        print(f"카테고리 '{args.category}'을(를) 찾을 수 없습니다.")
+        return 1
+    photo_paths = [(photo['path'], photo['name']) for photo in db.get_photos_by_category(args.category)]
+    zip_path = args.destination if args.zip else None
+    profile = None
+    if args.max_edge:
+        profile = {'max_edge': args.max_edge, 'quality': args.quality, 'strip_metadata': not args.keep_metadata}
+    exported, failed = export_photos(photo_paths, args.destination, zip_path, profile, workers=args.workers,
+                                     progress_callback=lambda done, total: print(
+                                         f"\r{done}/{total}", end='', file=sys.stderr))
+    print(file=sys.stderr)
+    print(f"{exported}장을 {args.destination}에 내보냈습니다." + (f" (실패 {failed}장)" if failed else ''))
+    return 0 if not failed else 1
+
+
+def command_dedupe(db, args):
+    if args.near:
+        from phash import find_near_duplicates, format_near_duplicate_report
+        print(format_near_duplicate_report(find_near_duplicates(db, args.threshold)))
+    else:
+        from dedupe import find_duplicates, format_duplicate_report
+        print(format_duplicate_report(find_duplicates(db)))
+    return 0
+
+
+def command_stats(db, args):
+    total_count, total_bytes = 0, 0
+    for stats in db.get_category_stats():
+        period = ''
+        if stats['first_taken_at']:
+            period = f"  {stats['first_taken_at'][:10]} ~ {stats['last_taken_at'][:10]}"
+        print(f"{stats['name']}: {stats['count']}장, {format_size(stats['total_bytes'])}{period}")
+        total_count += stats['count']
+        total_bytes += stats['total_bytes']
+    print(f"전체: {total_count}장, {format_size(total_bytes)}")
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description='사진관리프로그램 명령줄 도구')
+    parser.add_argument('--db', default=DATABASE_PATH, help='데이터베이스 파일 경로')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    import_parser = subparsers.add_parser('import', help='파일/폴더의 사진을 카테고리에 추가')
+    import_parser.add_argument('category')
+    import_parser.add_argument('paths', nargs='+')
+    import_parser.add_argument('--create-category', action='store_true', help='카테고리가 없으면 생성')
+    import_parser.add_argument('--in-place', action='store_true', help='저장소에 넣지 않고 원래 위치를 그대로 등록')
+    import_parser.set_defaults(handler=command_import)
+
+    rescan_parser = subparsers.add_parser('rescan', help='디스크와 데이터베이스의 변경 사항을 맞춤')
+    rescan_parser.set_defaults(handler=command_rescan)
+
+    export_parser = subparsers.add_parser('export', help='카테고리의 사진을 폴더로 내보내기')
+    export_parser.add_argument('category')
+    export_parser.add_argument('destination', help='내보낼 폴더 (--zip이면 ZIP 파일 경로)')
+    export_parser.add_argument('--zip', action='store_true', help='하나의 ZIP 파일로 묶기')
+    export_parser.add_argument('--workers', type=int, default=EXPORT_WORKERS, help='동시에 복사할 파일 수')
+    export_parser.add_argument('--max-edge', type=int, help='긴 변을 이 크기(px) 이하로 줄여 JPEG으로 내보내기')
+    export_parser.add_argument('--quality', type=int, default=85, help='--max-edge 사용 시 JPEG 품질')
+    export_parser.add_argument('--keep-metadata', action='store_true', help='--max-edge 사용 시 EXIF/색 프로필 유지')
+    export_parser.set_defaults(handler=command_export)
+
+    dedupe_parser = subparsers.add_parser('dedupe', help='중복 사진 보고서')
+    dedupe_parser.add_argument('--near', action='store_true', help='유사한 사진(크기 변경, 재압축)까지 찾기')
+    dedupe_parser.add_argument('--threshold', type=int, default=NEAR_DUPLICATE_THRESHOLD, help='유사도 해밍 거리 허용치')
+    dedupe_parser.set_defaults(handler=command_dedupe)
+
+    stats_parser = subparsers.add_parser('stats', help='카테고리별 통계')
+    stats_parser.set_defaults(handler=command_stats)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    from database import Database
+
+    db = Database(args.db)
+    try:
+        db.connect()
+        return args.handler(db, args)
+    finally:
+        db.close()
+
+
+if __name__ == '__main__':
+    multiprocessing.freeze_support()
+    sys.exit(main())
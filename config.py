@@ -1,6 +1,108 @@
 import os
+import sys
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+# 실행 파일 또는 스크립트의 디렉토리 경로 (GUI와 명령줄 도구가 같은 데이터베이스를 사용)
+if getattr(sys, 'frozen', False):
+    # 실행 파일로 실행될 때
+    APPLICATION_PATH = os.path.dirname(sys.executable)
+else:
+    # 스크립트로 실행될 때
+    APPLICATION_PATH = BASE_DIR
 RESOURCES_DIR = os.path.join(BASE_DIR, 'resources')
-DATABASE_PATH = os.path.join(BASE_DIR, 'photo_database.db')
+DATABASE_PATH = os.path.join(APPLICATION_PATH, 'photo_manager.db')
 DEFAULT_DOWNLOAD_DIR = os.path.join(os.path.expanduser('~'), 'Downloads')
+PHOTO_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.gif', '.bmp')
+
+# 썸네일 캐시 설정
+THUMBNAIL_DIR_NAME = 'thumbnails'
+THUMBNAIL_SIZES = (128, 256, 512, 1024)  # 긴 변 기준 크기 버킷
+THUMBNAIL_CACHE_MAX_BYTES = 256 * 1024 * 1024
+THUMBNAIL_QUALITY = 85
+
+# 백그라운드 이미지 디코딩 설정
+PREVIEW_DECODE_THREADS = 2
+PROGRESSIVE_PREVIEW = True  # JPEG은 저해상도 첫 화면을 먼저 보여주고 이어서 선명한 이미지로 교체
+QUICK_PREVIEW_DIVISOR = 4  # 빠른 첫 화면은 표시 크기의 1/4 이상이면 충분
+
+# 슬라이드쇼 미리 읽기 설정
+SLIDESHOW_PREFETCH_AHEAD = 3
+SLIDESHOW_PREFETCH_BEHIND = 1
+SLIDESHOW_DECODE_THREADS = 2
+
+# 일괄 가져오기 설정
+IMPORT_BATCH_SIZE = 1000  # 트랜잭션 하나에 넣을 사진 수
+
+# 데이터베이스 연결 설정
+DB_POOL_SIZE = 5  # 스레드별 연결을 포함한 최대 연결 수
+DB_POOL_TIMEOUT = 30  # 사용 가능한 연결을 기다리는 최대 시간(초)
+DB_BUSY_TIMEOUT = 5  # 다른 연결의 쓰기 잠금을 기다리는 시간(초)
+DB_PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA cache_size = -20000",  # 약 20MB
+    "PRAGMA mmap_size = 268435456",
+)
+
+# 사진 목록 설정
+PHOTO_PAGE_SIZE = 500  # 스크롤 시 한 번에 불러올 행 수
+
+# 격자 보기 설정
+GRID_THUMBNAIL_SIZE = 128
+GRID_THUMBNAIL_THREADS = 2
+GRID_THUMBNAIL_MEMORY_ITEMS = 2000  # 메모리에 유지할 격자 썸네일 수
+
+# 중복 검사 설정
+HASH_CHUNK_SIZE = 1024 * 1024  # 파일을 읽는 단위
+PARTIAL_HASH_SIZE = 64 * 1024  # 부분 해시에 사용할 앞부분 크기
+HASH_WORKERS = None  # None이면 CPU 코어 수만큼 프로세스 사용
+DUPLICATE_POLICY = 'skip'  # 'skip': 중복은 추가하지 않음, 'link': 추가하되 같은 content_hash로 연결
+# 'link'는 원래 위치를 그대로 등록할 때(IMPORT_INTO_STORE = False, cli import --in-place)만 적용됨
+# 저장소에는 같은 내용이 파일 하나로만 있고 경로는 사진 한 장에만 등록되므로 저장소로 가져오면 항상 'skip'
+
+# 유사 사진 검사 설정
+NEAR_DUPLICATE_THRESHOLD = 6  # dHash 해밍 거리 허용치 (64비트 중)
+
+# 폴더 감시 설정
+WATCH_DEBOUNCE_MS = 500  # 마지막 변경 후 이 시간 동안 조용하면 한 번에 반영
+WATCH_POLL_INTERVAL_MS = 5000  # 알림을 쓸 수 없을 때 폴더 수정 시각을 확인하는 주기
+WATCH_FORCE_POLLING = False  # 네트워크 공유처럼 알림이 오지 않는 저장소에서는 True
+
+# 검색 설정
+SEARCH_DEBOUNCE_MS = 150  # 입력이 멈춘 뒤 검색을 실행하기까지의 시간
+
+# 내보내기 설정
+EXPORT_WORKERS = 4  # 동시에 복사할 파일 수 (디스크/네트워크 대역폭 기준)
+EXPORT_COPY_CHUNK_SIZE = 8 * 1024 * 1024  # copy_file_range 한 번에 넘길 크기
+EXPORT_RESIZE_WORKERS = None  # 크기 변환 내보내기 프로세스 수, None이면 CPU 코어 수
+# 내보내기 프로필: None이면 원본 그대로 복사
+EXPORT_PROFILES = {
+    '원본': None,
+    '웹용 (긴 변 2048px)': {'max_edge': 2048, 'quality': 85, 'strip_metadata': True},
+    '메일용 (긴 변 1024px)': {'max_edge': 1024, 'quality': 80, 'strip_metadata': True},
+}
+
+# 성능 계측 설정
+PROFILING_ENABLED = True  # 주요 경로의 지연 시간을 히스토그램으로 수집 (Ctrl+Shift+D로 확인)
+PROFILE_DUMP_PATH = None  # 경로를 지정하면 종료할 때 측정 결과를 JSON으로 저장
+
+# 큰 사진 타일 보기 설정
+TILE_DIR_NAME = 'tiles'
+TILE_SIZE = 256
+TILE_QUALITY = 90
+TILE_MAX_IMAGE_PIXELS = 2 * 1000 * 1000 * 1000  # 타일을 만들 수 있는 최대 픽셀 수
+TILE_CACHE_MAX_PYRAMIDS = 20  # 디스크에 남겨 둘 피라미드 수
+TILE_VIEWER_MEMORY_TILES = 256  # 메모리에 유지할 디코딩된 타일 수
+
+# 디코딩된 이미지 메모리 캐시 설정 (미리보기와 슬라이드쇼가 함께 사용)
+IMAGE_CACHE_MAX_BYTES = 128 * 1024 * 1024
+PREVIEW_RESIZE_DEBOUNCE_MS = 150  # 창 크기 조절이 멈춘 뒤 해당 크기로 다시 디코딩하기까지의 시간
+
+# 사진 저장소 설정
+STORE_DIR_NAME = 'store'  # 데이터베이스 옆의 내용 주소 방식 저장소 폴더
+IMPORT_INTO_STORE = True  # 가져온 사진을 저장소에 넣음 (False면 원래 위치를 그대로 등록)
+# 저장소로 가져온 사진은 RESOURCES_DIR/<카테고리> 폴더에 없으며 카테고리는 데이터베이스에만 기록됨
+# reflink를 쓸 수 없을 때 같은 드라이브면 하드 링크 사용 (기본값은 reflink -> 복사)
+# 하드 링크는 원본과 같은 파일이므로 켜면 원본과 저장소 파일이 함께 읽기 전용이 되어 내용이 해시와 달라지지 않도록 함
+STORE_USE_HARDLINKS = False
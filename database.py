@@ -1,16 +1,97 @@
 import sqlite3
 import os
+import re
+import queue
+import threading
+from config import IMPORT_BATCH_SIZE, DB_POOL_SIZE, DB_POOL_TIMEOUT, DB_BUSY_TIMEOUT, DB_PRAGMAS
+from migrations import migrate
+import profiler
+
+
+class ConnectionPool:
+    def __init__(self, db_path, max_size=DB_POOL_SIZE, timeout=DB_POOL_TIMEOUT):
+        self.db_path = db_path
+        self.max_size = max_size
+        self.timeout = timeout
+        self._idle = queue.LifoQueue()
+        self._connections = []
+        self._lock = threading.Lock()
+
+    def _open_connection(self):
+        # 연결은 스레드 사이에서 넘겨 쓰므로 check_same_thread를 끄고, 한 번에 한 스레드만 사용하도록 풀에서 관리
+        conn = sqlite3.connect(self.db_path, timeout=DB_BUSY_TIMEOUT, check_same_thread=False)
+        for pragma in DB_PRAGMAS:
+            conn.execute(pragma)
+        return conn
+
+    def acquire(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if len(self._connections) < self.max_size:
+                conn = self._open_connection()
+                self._connections.append(conn)
+                return conn
+        try:
+            return self._idle.get(timeout=self.timeout)
+        except queue.Empty:
+            raise sqlite3.OperationalError("사용 가능한 데이터베이스 연결이 없습니다.")
+
+    def release(self, conn):
+        if conn.in_transaction:
+            conn.rollback()
+        self._idle.put(conn)
+
+    def close_all(self):
+        with self._lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections = []
+        self._idle = queue.LifoQueue()
+
 
 class Database:
+    INSERT_PHOTO_SQL = ("INSERT INTO photos (path, name, category_id, file_size, mtime_ns, content_hash) "
+                        "VALUES (?, ?, ?, ?, ?, ?)")
+    MAX_SQL_VARIABLES = 500
+
     def __init__(self, db_path):
         self.db_path = db_path
-        self.conn = None
-        self.cursor = None
+        self.pool = None
+        self._local = threading.local()
+
+    @property
+    def conn(self):
+        return self._thread_state().conn
+
+    @property
+    def cursor(self):
+        return self._thread_state().cursor
+
+    def _thread_state(self):
+        # 각 스레드는 풀에서 받은 자신만의 연결과 커서를 사용
+        state = self._local
+        if getattr(state, 'conn', None) is None:
+            if self.pool is None:
+                raise sqlite3.ProgrammingError("데이터베이스에 연결되지 않았습니다.")
+            state.conn = self.pool.acquire()
+            state.cursor = state.conn.cursor()
+        return state
+
+    def release_connection(self):
+        # 작업 스레드는 끝날 때 연결을 풀에 돌려줘야 함
+        state = self._local
+        if getattr(state, 'conn', None) is not None:
+            state.cursor.close()
+            self.pool.release(state.conn)
+            state.conn = None
+            state.cursor = None
 
     def connect(self):
         try:
-            self.conn = sqlite3.connect(self.db_path)
-            self.cursor = self.conn.cursor()
+            self.pool = ConnectionPool(self.db_path)
             self.create_tables()
         except sqlite3.Error as e:
             print(f"데이터베이스 연결 오류: {e}")
@@ -18,43 +99,28 @@ class Database:
 
     def create_tables(self):
         try:
-            self.cursor.execute('''
-                CREATE TABLE IF NOT EXISTS categories (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    name TEXT NOT NULL UNIQUE
-                )
-            ''')
-
-            self.cursor.execute('''
-                CREATE TABLE IF NOT EXISTS photos (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    path TEXT NOT NULL,
-                    name TEXT NOT NULL,
-                    category_id INTEGER,
-                    FOREIGN KEY (category_id) REFERENCES categories (id)
-                )
-            ''')
-            self.conn.commit()
+            # 스키마 생성과 기존 데이터베이스 업그레이드는 migrations 모듈에서 버전 순으로 수행
+            migrate(self.conn)
         except sqlite3.Error as e:
             print(f"테이블 생성 오류: {e}")
             raise
 
     def initialize_database(self):
-        if not os.path.exists(self.db_path):
-            try:
-                # 테이블 생성
-                self.create_tables()
+        # 새로 만든 데이터베이스에만 호출 (connect()가 파일을 만들기 전에 존재 여부를 확인할 것)
+        try:
+            # 테이블 생성
+            self.create_tables()
 
-                # 기본 카테고리 추가
-                default_categories = ['가족', '여행', '음식', '풍경', '기타']
-                for category in default_categories:
-                    self.add_category(category)
+            # 기본 카테고리 추가
+            default_categories = ['가족', '여행', '음식', '풍경', '기타']
+            for category in default_categories:
+                self.add_category(category)
 
-                self.conn.commit()
-                print("데이터베이스가 성공적으로 초기화되었습니다.")
-            except sqlite3.Error as e:
-                print(f"데이터베이스 초기화 중 오류 발생: {e}")
-                self.conn.rollback()
+            self.conn.commit()
+            print("데이터베이스가 성공적으로 초기화되었습니다.")
+        except sqlite3.Error as e:
+            print(f"데이터베이스 초기화 중 오류 발생: {e}")
+            self.conn.rollback()
 
     def add_category(self, category_name):
         try:
@@ -102,19 +168,95 @@ class Database:
             self.cursor.execute("SELECT id FROM categories WHERE name = ?", (category_name,))
             category_id = self.cursor.fetchone()
             if category_id:
-                photo_name = os.path.basename(photo_path)
-                self.cursor.execute("INSERT INTO photos (path, name, category_id) VALUES (?, ?, ?)", 
-                                    (photo_path, photo_name, category_id[0]))
+                self.cursor.execute(self.INSERT_PHOTO_SQL, self._photo_row(photo_path, category_id[0]))
                 self.conn.commit()
                 return True
             else:
                 print(f"카테고리 '{category_name}'을(를) 찾을 수 없습니다.")
                 return False
+        except sqlite3.IntegrityError:
+            print(f"이미 등록된 사진입니다: {photo_path}")
+            self.conn.rollback()
+            return False
         except sqlite3.Error as e:
             print(f"사진 추가 오류: {e}")
             self.conn.rollback()
             return False
 
+    def move_photos(self, photo_ids, category_name):
+        # 카테고리는 데이터베이스에만 있으므로 파일은 건드리지 않고 category_id만 바꿈
+        photo_ids = list(photo_ids)
+        try:
+            self.cursor.execute("SELECT id FROM categories WHERE name = ?", (category_name,))
+            category_id = self.cursor.fetchone()
+            if not category_id:
+                print(f"카테고리 '{category_name}'을(를) 찾을 수 없습니다.")
+                return 0
+            self.cursor.executemany("UPDATE photos SET category_id = ? WHERE id = ?",
+                                    [(category_id[0], photo_id) for photo_id in photo_ids])
+            moved = self.cursor.rowcount
+            self.conn.commit()
+            return moved
+        except sqlite3.Error as e:
+            print(f"사진 이동 오류: {e}")
+            self.conn.rollback()
+            return 0
+
+    def move_photo(self, photo_id, category_name):
+        return self.move_photos([photo_id], category_name) == 1
+
+    def add_photos(self, photo_paths, category_name, batch_size=IMPORT_BATCH_SIZE,
+                   progress_callback=None, should_stop=None):
+        # 카테고리 id는 한 번만 조회하고, batch_size 단위로 executemany + commit
+        added = 0
+        try:
+            self.cursor.execute("SELECT id FROM categories WHERE name = ?", (category_name,))
+            category_id = self.cursor.fetchone()
+            if not category_id:
+                print(f"카테고리 '{category_name}'을(를) 찾을 수 없습니다.")
+                return 0
+
+            batch = []
+            for photo in photo_paths:
+                # 항목은 경로 또는 (경로, content_hash[, 표시 이름]) 튜플 (저장소 파일은 이름이 해시이므로 원래 이름을 함께 받음)
+                if isinstance(photo, tuple):
+                    batch.append(self._photo_row(photo[0], category_id[0], *photo[1:]))
+                else:
+                    batch.append(self._photo_row(photo, category_id[0]))
+                if len(batch) >= batch_size:
+                    added += self._insert_photo_batch(batch)
+                    batch = []
+                    if progress_callback:
+                        progress_callback(added)
+                    if should_stop and should_stop():
+                        return added
+            if batch:
+                added += self._insert_photo_batch(batch)
+                if progress_callback:
+                    progress_callback(added)
+            return added
+        except sqlite3.Error as e:
+            print(f"사진 일괄 추가 오류: {e}")
+            self.conn.rollback()
+            return added
+
+    def _insert_photo_batch(self, batch):
+        # 이미 등록된 경로는 건너뛰고 실제로 추가된 행 수만 반환
+        # total_changes는 검색 색인/통계 트리거가 쓴 행까지 세므로 photos에 들어간 행 수인 rowcount를 사용
+        self.cursor.executemany(self.INSERT_PHOTO_SQL.replace("INSERT", "INSERT OR IGNORE", 1), batch)
+        inserted = self.cursor.rowcount
+        self.conn.commit()
+        return inserted
+
+    @staticmethod
+    def _photo_row(photo_path, category_id, content_hash=None, name=None):
+        try:
+            stat_result = os.stat(photo_path)
+            file_size, mtime_ns = stat_result.st_size, stat_result.st_mtime_ns
+        except OSError:
+            file_size, mtime_ns = None, None
+        return (photo_path, name or os.path.basename(photo_path), category_id, file_size, mtime_ns, content_hash)
+
     def get_photos_by_category(self, category_name):
         try:
             self.cursor.execute("""
@@ -128,6 +270,343 @@ class Database:
             print(f"사진 조회 오류: {e}")
             return []
 
+    def get_photos_page(self, category_name, after_id=0, limit=500):
+        # id 기준 키셋 페이지 조회: idx_photos_category (category_id, id) 인덱스만으로 처리됨
+        try:
+            self.cursor.execute("""
+                SELECT photos.id, photos.path, photos.name
+                FROM photos
+                WHERE photos.category_id = (SELECT id FROM categories WHERE name = ?)
+                  AND photos.id > ?
+                ORDER BY photos.id
+                LIMIT ?
+            """, (category_name, after_id, limit))
+            return self.cursor.fetchall()
+        except sqlite3.Error as e:
+            print(f"사진 조회 오류: {e}")
+            return []
+
+    def iter_photo_files(self):
+        # 중복 검사용: 전체 사진의 (id, path, file_size, content_hash)를 한 행씩 돌려줌
+        try:
+            cursor = self.conn.cursor()
+            cursor.execute("SELECT id, path, file_size, content_hash FROM photos")
+            yield from cursor
+        except sqlite3.Error as e:
+            print(f"사진 조회 오류: {e}")
+
+    def find_photo_ids_by_hashes(self, content_hashes):
+        found = {}
+        content_hashes = list(content_hashes)
+        try:
+            for start in range(0, len(content_hashes), self.MAX_SQL_VARIABLES):
+                chunk = content_hashes[start:start + self.MAX_SQL_VARIABLES]
+                placeholders = ','.join('?' * len(chunk))
+                self.cursor.execute(
+                    f"SELECT content_hash, MIN(id) FROM photos WHERE content_hash IN ({placeholders}) "
+                    f"GROUP BY content_hash", chunk)
+                found.update(self.cursor.fetchall())
+        except sqlite3.Error as e:
+            print(f"해시 조회 오류: {e}")
+        return found
+
+    def set_content_hashes(self, id_hash_pairs):
+        try:
+            self.cursor.executemany("UPDATE photos SET content_hash = ? WHERE id = ?",
+                                    [(content_hash, photo_id) for photo_id, content_hash in id_hash_pairs])
+            self.conn.commit()
+            return True
+        except sqlite3.Error as e:
+            print(f"해시 저장 오류: {e}")
+            self.conn.rollback()
+            return False
+
+    def iter_photos_missing_phash(self):
+        try:
+            cursor = self.conn.cursor()
+            cursor.execute("SELECT id, path FROM photos WHERE phash IS NULL")
+            yield from cursor
+        except sqlite3.Error as e:
+            print(f"사진 조회 오류: {e}")
+
+    def iter_phashes(self):
+        try:
+            cursor = self.conn.cursor()
+            cursor.execute("SELECT id, phash FROM photos WHERE phash IS NOT NULL")
+            yield from cursor
+        except sqlite3.Error as e:
+            print(f"사진 조회 오류: {e}")
+
+    def set_phashes(self, id_phash_pairs):
+        try:
+            self.cursor.executemany("UPDATE photos SET phash = ? WHERE id = ?",
+                                    [(phash, photo_id) for photo_id, phash in id_phash_pairs])
+            self.conn.commit()
+            return True
+        except sqlite3.Error as e:
+            print(f"유사도 해시 저장 오류: {e}")
+            self.conn.rollback()
+            return False
+
+    def iter_photos_missing_metadata(self):
+        # 크기 정보는 읽을 수 있는 모든 이미지에 있으므로 width가 비어 있으면 아직 추출하지 않은 사진
+        # 읽을 수 없었던 파일은 width = 0으로 표시되어 파일이 바뀌기 전(재스캔이 NULL로 되돌림)까지 다시 읽지 않음
+        try:
+            cursor = self.conn.cursor()
+            cursor.execute("SELECT id, path FROM photos WHERE width IS NULL")
+            yield from cursor
+        except sqlite3.Error as e:
+            print(f"사진 조회 오류: {e}")
+
+    def set_photo_metadata(self, metadata_rows):
+        try:
+            self.cursor.executemany("""
+                UPDATE photos
+                SET width = :width, height = :height, taken_at = :taken_at,
+                    camera = :camera, orientation = :orientation
+                WHERE id = :id
+            """, metadata_rows)
+            self.conn.commit()
+            return True
+        except sqlite3.Error as e:
+            print(f"메타데이터 저장 오류: {e}")
+            self.conn.rollback()
+            return False
+
+    def get_photos_by_date_range(self, start, end, category_name=None, camera=None, after=None, limit=500):
+        # start/end는 'YYYY-MM-DD HH:MM:SS' 문자열이며 taken_at 인덱스로 범위 검색
+        # after는 이전 페이지 마지막 행의 (taken_at, id): 인덱스 순서 그대로 이어서 읽으므로 정렬 단계가 없음
+        conditions = ["photos.taken_at BETWEEN ? AND ?"]
+        params = [start, end]
+        if after:
+            conditions.append("(photos.taken_at, photos.id) > (?, ?)")
+            params.extend(after)
+        if category_name:
+            conditions.append("photos.category_id = (SELECT id FROM categories WHERE name = ?)")
+            params.append(category_name)
+        if camera:
+            conditions.append("photos.camera = ?")
+            params.append(camera)
+        params.append(limit)
+        try:
+            self.cursor.execute(f"""
+                SELECT photos.id, photos.path, photos.name, photos.taken_at
+                FROM photos
+                WHERE {' AND '.join(conditions)}
+                ORDER BY photos.taken_at, photos.id
+                LIMIT ?
+            """, params)
+            return self.cursor.fetchall()
+        except sqlite3.Error as e:
+            print(f"사진 조회 오류: {e}")
+            return []
+
+    def get_cameras(self):
+        try:
+            self.cursor.execute("SELECT DISTINCT camera FROM photos WHERE camera IS NOT NULL ORDER BY camera")
+            return [row[0] for row in self.cursor.fetchall()]
+        except sqlite3.Error as e:
+            print(f"카메라 조회 오류: {e}")
+            return []
+
+    def iter_photo_index(self, directories=None):
+        # 재스캔용: 경로별로 저장된 파일 크기/수정 시각
+        # directories를 주면 그 폴더 아래의 경로만 경로 인덱스의 범위 검색으로 조회 (하위 폴더 포함)
+        try:
+            cursor = self.conn.cursor()
+            if directories is None:
+                cursor.execute("SELECT id, path, category_id, file_size, mtime_ns FROM photos")
+                yield from cursor
+                return
+            prefixes = set()
+            for directory in directories:
+                prefixes.add(os.path.join(directory, ''))
+                if os.altsep:
+                    prefixes.add(os.path.join(directory, '').replace(os.sep, os.altsep))
+            for prefix in prefixes:
+                # 구분자 다음 문자로 상한을 잡으면 prefix로 시작하는 경로만 범위에 들어감
+                upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+                cursor.execute("SELECT id, path, category_id, file_size, mtime_ns FROM photos "
+                               "WHERE path >= ? AND path < ?", (prefix, upper))
+                yield from cursor
+        except sqlite3.Error as e:
+            print(f"사진 조회 오류: {e}")
+
+    def get_category_ids(self):
+        try:
+            self.cursor.execute("SELECT name, id FROM categories")
+            return dict(self.cursor.fetchall())
+        except sqlite3.Error as e:
+            print(f"카테고리 조회 오류: {e}")
+            return {}
+
+    def apply_scan_changes(self, added_rows, changed_rows, missing_ids):
+        # 추가/변경/삭제를 하나의 트랜잭션으로 반영
+        # added_rows: (path, name, category_id, file_size, mtime_ns), changed_rows: (file_size, mtime_ns, id)
+        try:
+            self.cursor.executemany(
+                "INSERT OR IGNORE INTO photos (path, name, category_id, file_size, mtime_ns) VALUES (?, ?, ?, ?, ?)",
+                added_rows)
+            # 내용이 바뀐 파일은 해시와 메타데이터를 비워 다음 추출 단계에서 다시 계산되도록 함
+            self.cursor.executemany("""
+                UPDATE photos
+                SET file_size = ?, mtime_ns = ?, content_hash = NULL, phash = NULL,
+                    width = NULL, height = NULL, taken_at = NULL, camera = NULL, orientation = NULL
+                WHERE id = ?
+            """, changed_rows)
+            missing_ids = list(missing_ids)
+            for start in range(0, len(missing_ids), self.MAX_SQL_VARIABLES):
+                chunk = missing_ids[start:start + self.MAX_SQL_VARIABLES]
+                self.cursor.execute(f"DELETE FROM photos WHERE id IN ({','.join('?' * len(chunk))})", chunk)
+            self.conn.commit()
+            return True
+        except sqlite3.Error as e:
+            print(f"스캔 결과 반영 오류: {e}")
+            self.conn.rollback()
+            return False
+
+    @staticmethod
+    def build_search_query(text):
+        # 입력을 단어로 나눠 각 단어를 접두어 검색으로 만들고 모두 포함하는 사진을 찾음 (FTS5 문법 문자는 제거)
+        words = re.findall(r'\w+', text)
+        return ' '.join(f'"{word}"*' for word in words)
+
+    def search_photos(self, text, category_name=None, after_id=0, limit=500):
+        query = self.build_search_query(text)
+        if not query:
+            return []
+        conditions = ["photos_fts MATCH ?", "photos_fts.rowid > ?"]
+        params = [query, after_id]
+        if category_name:
+            conditions.append("photos.category_id = (SELECT id FROM categories WHERE name = ?)")
+            params.append(category_name)
+        params.append(limit)
+        try:
+            self.cursor.execute(f"""
+                SELECT photos.id, photos.path, photos.name
+                FROM photos_fts
+                JOIN photos ON photos.id = photos_fts.rowid
+                WHERE {' AND '.join(conditions)}
+                ORDER BY photos_fts.rowid
+                LIMIT ?
+            """, params)
+            return self.cursor.fetchall()
+        except sqlite3.Error as e:
+            print(f"사진 검색 오류: {e}")
+            return []
+
+    def get_photo_tags(self, photo_id):
+        try:
+            self.cursor.execute("""
+                SELECT tags.name
+                FROM photo_tags
+                JOIN tags ON tags.id = photo_tags.tag_id
+                WHERE photo_tags.photo_id = ?
+                ORDER BY tags.name
+            """, (photo_id,))
+            return [row[0] for row in self.cursor.fetchall()]
+        except sqlite3.Error as e:
+            print(f"태그 조회 오류: {e}")
+            return []
+
+    def set_photo_tags(self, photo_id, tag_names):
+        # 사진의 태그 목록을 통째로 교체 (검색 색인은 트리거가 갱신)
+        tag_names = sorted({name.strip() for name in tag_names if name.strip()})
+        try:
+            self.cursor.execute("DELETE FROM photo_tags WHERE photo_id = ?", (photo_id,))
+            self.cursor.executemany("INSERT OR IGNORE INTO tags (name) VALUES (?)", [(name,) for name in tag_names])
+            self.cursor.executemany("""
+                INSERT INTO photo_tags (photo_id, tag_id)
+                SELECT ?, id FROM tags WHERE name = ?
+            """, [(photo_id, name) for name in tag_names])
+            self.conn.commit()
+            return True
+        except sqlite3.Error as e:
+            print(f"태그 저장 오류: {e}")
+            self.conn.rollback()
+            return False
+
+    def get_photos_by_tag(self, tag_name, after_id=0, limit=500):
+        try:
+            self.cursor.execute("""
+                SELECT photos.id, photos.path, photos.name
+                FROM photo_tags
+                JOIN photos ON photos.id = photo_tags.photo_id
+                WHERE photo_tags.tag_id = (SELECT id FROM tags WHERE name = ?)
+                  AND photo_tags.photo_id > ?
+                ORDER BY photo_tags.photo_id
+                LIMIT ?
+            """, (tag_name, after_id, limit))
+            return self.cursor.fetchall()
+        except sqlite3.Error as e:
+            print(f"사진 조회 오류: {e}")
+            return []
+
+    def get_category_stats(self):
+        # 카테고리별 사진 수, 전체 크기, 촬영 기간 (카테고리 목록과 같은 순서)
+        try:
+            # 트리거로 유지되는 요약 테이블만 읽으므로 사진 수와 무관하게 카테고리 수만큼의 행만 조회
+            self.cursor.execute("""
+                SELECT categories.name, COALESCE(category_stats.photo_count, 0),
+                       COALESCE(category_stats.total_bytes, 0),
+                       category_stats.first_taken_at, category_stats.last_taken_at
+                FROM categories
+                LEFT JOIN category_stats ON category_stats.category_id = categories.id
+                ORDER BY categories.id
+            """)
+            return [{'name': row[0], 'count': row[1], 'total_bytes': row[2],
+                     'first_taken_at': row[3], 'last_taken_at': row[4]} for row in self.cursor.fetchall()]
+        except sqlite3.Error as e:
+            print(f"통계 조회 오류: {e}")
+            return []
+
+    def get_photos_by_ids(self, photo_ids):
+        photos = []
+        photo_ids = list(photo_ids)
+        try:
+            for start in range(0, len(photo_ids), self.MAX_SQL_VARIABLES):
+                chunk = photo_ids[start:start + self.MAX_SQL_VARIABLES]
+                placeholders = ','.join('?' * len(chunk))
+                self.cursor.execute(f"""
+                    SELECT photos.id, photos.path, photos.name, categories.name
+                    FROM photos
+                    LEFT JOIN categories ON photos.category_id = categories.id
+                    WHERE photos.id IN ({placeholders})
+                """, chunk)
+                photos.extend({'id': row[0], 'path': row[1], 'name': row[2], 'category': row[3]}
+                              for row in self.cursor.fetchall())
+        except sqlite3.Error as e:
+            print(f"사진 조회 오류: {e}")
+        return photos
+
     def close(self):
-        if self.conn:
-            self.conn.close()
+        if self.pool:
+            self.pool.close_all()
+            self.pool = None
+        self._local = threading.local()
+
+
+# 모든 조회/저장 메서드의 지연 시간을 'db.<메서드 이름>'으로 수집 (연결 관리는 제외)
+profiler.instrument(Database, 'db', exclude=('connect', 'close', 'release_connection'))
+
+
+if __name__ == '__main__':
+    # 테스트 코드: add_photos가 트리거가 쓴 행을 빼고 실제로 추가된 사진 수만 돌려주는지 확인
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        test_db = Database(os.path.join(temp_dir, 'test.db'))
+        test_db.connect()
+        test_db.create_tables()
+        test_db.add_category('test_category')
+        test_paths = []
+        for name in ('a.jpg', 'b.jpg'):
+            test_paths.append(os.path.join(temp_dir, name))
+            with open(test_paths[-1], 'wb') as f:
+                f.write(b'test')
+        added = test_db.add_photos(test_paths, 'test_category')
+        print(f"추가된 사진 수: {added} (예상 2)")
+        added_again = test_db.add_photos(test_paths, 'test_category')
+        print(f"다시 추가한 사진 수: {added_again} (예상 0)")
+        test_db.close()
+        assert (added, added_again) == (2, 0)
@@ -0,0 +1,68 @@
+import os
+import time
+from PyQt5.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QPlainTextEdit, QPushButton, QFileDialog
+from PyQt5.QtGui import QFont
+from config import APPLICATION_PATH
+from image_cache import shared_cache
+import profiler
+
+
+class DebugPanel(QDialog):
+    # 지연 시간 히스토그램을 보고, 사용자 동작 하나를 cProfile로 분석하는 창 (Ctrl+Shift+D)
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle('성능 측정')
+        self.resize(900, 500)
+
+        self.report_edit = QPlainTextEdit()
+        self.report_edit.setReadOnly(True)
+        self.report_edit.setFont(QFont('Consolas', 9))
+
+        self.refresh_btn = QPushButton('새로고침')
+        self.reset_btn = QPushButton('초기화')
+        self.save_btn = QPushButton('저장')
+        self.profile_btn = QPushButton('cProfile 시작')
+        self.profile_btn.setCheckable(True)
+        self.refresh_btn.clicked.connect(self.refresh)
+        self.reset_btn.clicked.connect(self.reset)
+        self.save_btn.clicked.connect(self.save)
+        self.profile_btn.toggled.connect(self.toggle_profile)
+
+        button_layout = QHBoxLayout()
+        for button in (self.refresh_btn, self.reset_btn, self.save_btn, self.profile_btn):
+            button_layout.addWidget(button)
+        layout = QVBoxLayout()
+        layout.addWidget(self.report_edit)
+        layout.addLayout(button_layout)
+        self.setLayout(layout)
+
+    def refresh(self):
+        if not profiler.is_profiling():
+            stats = shared_cache.stats()
+            cache_line = (f"이미지 캐시: {stats['entries']}장, {stats['bytes'] / 1024 / 1024:.1f}MB"
+                          f" / {stats['max_bytes'] / 1024 / 1024:.0f}MB, 적중 {stats['hits']}, 실패 {stats['misses']}"
+                          f" (적중률 {stats['hit_rate'] * 100:.0f}%)")
+            self.report_edit.setPlainText(f"{profiler.format_report()}\n\n{cache_line}")
+
+    def reset(self):
+        profiler.reset()
+        self.refresh()
+
+    def save(self):
+        default_path = os.path.join(APPLICATION_PATH, f"latency_{time.strftime('%Y%m%d_%H%M%S')}.json")
+        path, _ = QFileDialog.getSaveFileName(self, '측정 결과 저장', default_path, 'JSON 파일 (*.json)')
+        if path:
+            profiler.dump(path)
+
+    def toggle_profile(self, checked):
+        # 시작을 누르고 느린 동작을 재현한 뒤 중지를 누르면 그 사이의 함수별 시간이 표시됨
+        if checked:
+            profiler.start_profile()
+            self.profile_btn.setText('cProfile 중지')
+            self.report_edit.setPlainText('분석 중... 느린 동작을 재현한 뒤 중지를 누르세요.')
+            return
+        profile_path = os.path.join(APPLICATION_PATH, f"profile_{time.strftime('%Y%m%d_%H%M%S')}.prof")
+        report = profiler.stop_profile(profile_path)
+        self.profile_btn.setText('cProfile 시작')
+        if report is not None:
+            self.report_edit.setPlainText(f"{profile_path}\n\n{report}")
@@ -0,0 +1,138 @@
+import os
+import sys
+import hashlib
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import islice
+from config import HASH_CHUNK_SIZE, PARTIAL_HASH_SIZE, HASH_WORKERS, DUPLICATE_POLICY, IMPORT_BATCH_SIZE
+
+
+def hash_file(file_path, limit=None, chunk_size=HASH_CHUNK_SIZE):
+    # 파일 전체를 메모리에 올리지 않고 chunk_size 단위로 읽어 SHA-256 계산 (limit이 있으면 앞부분만)
+    digest = hashlib.sha256()
+    remaining = limit
+    try:
+        with open(file_path, 'rb') as f:
+            while remaining is None or remaining > 0:
+                size = chunk_size if remaining is None else min(chunk_size, remaining)
+                chunk = f.read(size)
+                if not chunk:
+                    break
+                digest.update(chunk)
+                if remaining is not None:
+                    remaining -= len(chunk)
+    except (FileNotFoundError, PermissionError, IOError) as e:
+        print(f"파일 해시 계산 중 오류 발생: {e}")
+        return None
+    return digest.hexdigest()
+
+
+def hash_files(file_paths, limit=None, executor=None):
+    # 프로세스 풀에서 병렬로 해시를 계산하고 입력 순서대로 (경로, 해시)를 돌려줌
+    file_paths = list(file_paths)
+    if executor is None:
+        with ProcessPoolExecutor(max_workers=HASH_WORKERS) as own_executor:
+            return hash_files(file_paths, limit, own_executor)
+    chunksize = max(1, len(file_paths) // 64)
+    digests = executor.map(partial(hash_file, limit=limit), file_paths, chunksize=chunksize)
+    return list(zip(file_paths, digests))
+
+
+def iter_new_photos(db, photo_paths, policy=DUPLICATE_POLICY, batch_size=IMPORT_BATCH_SIZE, stats=None):
+    # 가져오기 단계: 경로를 batch_size씩 해시하여 (경로, 해시)로 넘기고, 'skip' 정책이면 중복은 걸러냄
+    seen = set()
+    photo_paths = iter(photo_paths)
+    with ProcessPoolExecutor(max_workers=HASH_WORKERS) as executor:
+        while True:
+            batch = list(islice(photo_paths, batch_size))
+            if not batch:
+                break
+            hashed = hash_files(batch, executor=executor)
+            existing = db.find_photo_ids_by_hashes({digest for _, digest in hashed if digest})
+            for photo_path, digest in hashed:
+                duplicate = digest is not None and (digest in existing or digest in seen)
+                if duplicate and stats is not None:
+                    stats['duplicates'] = stats.get('duplicates', 0) + 1
+                if duplicate and policy == 'skip':
+                    continue
+                if digest is not None:
+                    seen.add(digest)
+                yield (photo_path, digest)
+
+
+def find_duplicates(db):
+    # 크기 -> 앞부분 해시 -> 전체 해시 순으로 후보를 좁혀 모든 파일을 끝까지 읽지 않도록 함
+    by_size = defaultdict(list)
+    known_hashes = {}
+    for photo_id, path, file_size, content_hash in db.iter_photo_files():
+        if file_size is None:
+            try:
+                file_size = os.path.getsize(path)
+            except OSError:
+                continue
+        by_size[file_size].append((photo_id, path))
+        if content_hash:
+            known_hashes[photo_id] = content_hash
+
+    candidates = [photo for photos in by_size.values() if len(photos) > 1 for photo in photos]
+    if not candidates:
+        return []
+
+    with ProcessPoolExecutor(max_workers=HASH_WORKERS) as executor:
+        partial_hashes = dict(hash_files([path for _, path in candidates], PARTIAL_HASH_SIZE, executor))
+        by_partial = defaultdict(list)
+        for size, photos in by_size.items():
+            if len(photos) > 1:
+                for photo_id, path in photos:
+                    if partial_hashes.get(path):
+                        by_partial[(size, partial_hashes[path])].append((photo_id, path))
+
+        # 앞부분까지 같은 파일만 전체 해시를 비교하며, 이미 저장된 해시는 다시 계산하지 않음
+        by_full = defaultdict(list)
+        to_full = []
+        for photos in by_partial.values():
+            if len(photos) < 2:
+                continue
+            for photo_id, path in photos:
+                if photo_id in known_hashes:
+                    by_full[known_hashes[photo_id]].append(photo_id)
+                else:
+                    to_full.append((photo_id, path))
+        full_hashes = dict(hash_files([path for _, path in to_full], executor=executor))
+
+    new_hashes = []
+    for photo_id, path in to_full:
+        digest = full_hashes.get(path)
+        if digest:
+            by_full[digest].append(photo_id)
+            new_hashes.append((photo_id, digest))
+    if new_hashes:
+        db.set_content_hashes(new_hashes)
+
+    groups = []
+    for digest, photo_ids in by_full.items():
+        if len(photo_ids) > 1:
+            groups.append({'content_hash': digest, 'photos': db.get_photos_by_ids(sorted(photo_ids))})
+    return groups
+
+
+def format_duplicate_report(groups):
+    if not groups:
+        return "중복된 사진이 없습니다."
+    lines = [f"중복 그룹 {len(groups)}개"]
+    for group in groups:
+        lines.append(f"\n[{group['content_hash'][:12]}] {len(group['photos'])}장")
+        for photo in group['photos']:
+            lines.append(f"  - ({photo['category']}) {photo['path']}")
+    return '\n'.join(lines)
+
+
+if __name__ == '__main__':
+    from database import Database
+    from config import DATABASE_PATH
+
+    db = Database(sys.argv[1] if len(sys.argv) > 1 else DATABASE_PATH)
+    db.connect()
+    print(format_duplicate_report(find_duplicates(db)))
+    db.close()
@@ -0,0 +1,220 @@
+import os
+import sys
+import errno
+import shutil
+import zipfile
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from functools import partial
+from itertools import takewhile
+from config import EXPORT_WORKERS, EXPORT_COPY_CHUNK_SIZE, EXPORT_RESIZE_WORKERS
+
+TAG_ORIENTATION = 0x0112
+
+# copy_file_range를 지원하지 않는 파일 시스템/커널에서 일반 복사로 되돌아갈 오류
+_FALLBACK_ERRNOS = {errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP, errno.ENOTSUP, errno.EBADF}
+
+
+def copy_file(source_path, destination_path):
+    # 리눅스는 copy_file_range로 커널 안에서 복사 (btrfs/xfs는 reflink), 그 외에는 shutil.copy2
+    # (shutil도 리눅스 sendfile, macOS fcopyfile, 윈도우 CopyFile2를 사용하므로 사용자 공간 버퍼를 거치지 않음)
+    if hasattr(os, 'copy_file_range'):
+        try:
+            with open(source_path, 'rb') as source, open(destination_path, 'wb') as destination:
+                source_fd, destination_fd = source.fileno(), destination.fileno()
+                while os.copy_file_range(source_fd, destination_fd, EXPORT_COPY_CHUNK_SIZE):
+                    pass
+            shutil.copystat(source_path, destination_path)
+            return destination_path
+        except OSError as e:
+            if e.errno not in _FALLBACK_ERRNOS:
+                raise
+    return shutil.copy2(source_path, destination_path)
+
+
+def render_photo(source_path, max_edge, quality, strip_metadata=True):
+    # 프로필에 맞게 줄여 JPEG 바이트로 돌려줌 (프로세스 풀에서 실행)
+    import io
+    from PIL import Image, ImageOps
+
+    with Image.open(source_path) as image:
+        # JPEG은 DCT 단계에서 1/2~1/8로 축소 디코딩하여 원본 해상도 전체를 풀지 않음
+        image.draft('RGB', (max_edge, max_edge))
+        exif = image.getexif()
+        icc_profile = image.info.get('icc_profile')
+        # 메타데이터를 지워도 방향이 맞도록 회전 정보를 픽셀에 반영
+        image = ImageOps.exif_transpose(image)
+        # 그 밖의 형식은 thumbnail이 reduce()로 정수배 축소를 먼저 한 뒤 LANCZOS로 다듬음
+        image.thumbnail((max_edge, max_edge), Image.LANCZOS)
+        if image.mode != 'RGB':
+            image = image.convert('RGB')
+
+        options = {'quality': quality, 'optimize': True}
+        if not strip_metadata:
+            exif[TAG_ORIENTATION] = 1
+            options['exif'] = exif.tobytes()
+            if icc_profile:
+                options['icc_profile'] = icc_profile
+        output = io.BytesIO()
+        image.save(output, 'JPEG', **options)
+        return output.getvalue()
+
+
+def render_photo_file(source_path, destination_path, max_edge, quality, strip_metadata=True):
+    data = render_photo(source_path, max_edge, quality, strip_metadata)
+    with open(destination_path, 'wb') as f:
+        f.write(data)
+    return destination_path
+
+
+def export_name(file_name, profile=None):
+    # 크기를 바꿔 내보내면 항상 JPEG으로 저장하므로 확장자도 맞춤
+    if profile is None:
+        return file_name
+    return os.path.splitext(file_name)[0] + '.jpg'
+
+
+def unique_name(file_name, used_names):
+    # 같은 이름이 있으면 '이름 (1).jpg'처럼 번호를 붙임 (윈도우/맥 파일 시스템처럼 대소문자 구분 없이 비교)
+    stem, ext = os.path.splitext(file_name)
+    candidate = file_name
+    number = 1
+    while candidate.lower() in used_names:
+        candidate = f"{stem} ({number}){ext}"
+        number += 1
+    used_names.add(candidate.lower())
+    return candidate
+
+
+def _export_executor(profile, workers):
+    # 원본 복사는 입출력 위주이므로 스레드, 크기 변환은 CPU 위주이므로 모든 코어의 프로세스를 사용
+    if profile is None:
+        return ThreadPoolExecutor(max_workers=workers), workers
+    process_count = EXPORT_RESIZE_WORKERS or os.cpu_count() or 1
+    return ProcessPoolExecutor(max_workers=process_count), process_count
+
+
+def _run_windowed(executor, window, tasks, should_stop=None):
+    # (작업 함수, 인자, 값) 목록을 최대 window개만 대기시키며 제출하고 입력 순서대로 (값, 결과, 오류)를 돌려줌
+    # 대기 작업 수를 제한하여 취소하면 곧바로 멈추고 메모리도 일정하게 유지
+    pending = deque()
+    tasks = iter(tasks)
+    while True:
+        stopped = should_stop and should_stop()
+        while not stopped and len(pending) < window:
+            task = next(tasks, None)
+            if task is None:
+                break
+            function, args, value = task
+            pending.append((executor.submit(function, *args), value))
+        if not pending:
+            break
+        future, value = pending.popleft()
+        try:
+            yield value, future.result(), None
+        except Exception as e:
+            yield value, None, e
+
+
+def export_photos(photo_paths, destination, zip_path=None, profile=None, workers=EXPORT_WORKERS,
+                  progress_callback=None, should_stop=None):
+    # destination 폴더로 복사하거나, zip_path가 있으면 하나의 ZIP 파일로 묶음
+    # profile({'max_edge', 'quality', 'strip_metadata'})이 있으면 크기를 줄이고 다시 압축하여 내보냄
+    # photo_paths의 항목은 경로 또는 (경로, 내보낼 이름) 튜플 (저장소 파일은 이름이 해시이므로 photos.name을 함께 넘김)
+    # 반환값: (내보낸 사진 수, 실패한 사진 수), 취소 여부는 호출한 쪽의 should_stop으로 판단
+    # 폴더로 내보내다 취소하면 이미 복사한 파일은 남고, ZIP은 만들어지지 않음(0, 0)
+    photo_paths = [photo if isinstance(photo, tuple) else (photo, os.path.basename(photo)) for photo in photo_paths]
+    if zip_path:
+        return _export_zip(photo_paths, zip_path, profile, workers, progress_callback, should_stop)
+
+    os.makedirs(destination, exist_ok=True)
+    try:
+        used_names = {name.lower() for name in os.listdir(destination)}
+    except OSError:
+        used_names = set()
+
+    function = copy_file if profile is None else partial(render_photo_file, **profile)
+
+    def tasks():
+        for source_path, name in photo_paths:
+            target = os.path.join(destination, unique_name(export_name(name, profile), used_names))
+            yield function, (source_path, target), target
+
+    exported, failed = 0, 0
+    total = len(photo_paths)
+    executor, pool_size = _export_executor(profile, workers)
+    with executor:
+        for done, (target, _, error) in enumerate(_run_windowed(executor, pool_size * 2, tasks(), should_stop), start=1):
+            if error is None:
+                exported += 1
+            else:
+                print(f"파일 내보내기 중 오류 발생: {error}")
+                failed += 1
+                _remove_partial(target)
+            if progress_callback:
+                progress_callback(done, total)
+    return exported, failed
+
+
+def _export_zip(photo_paths, zip_path, profile=None, workers=EXPORT_WORKERS, progress_callback=None, should_stop=None):
+    # 사진은 이미 압축된 형식이므로 다시 압축하지 않고(ZIP_STORED) 차례로 흘려 씀
+    # 크기 변환은 프로세스 풀에서 병렬로 하고 결과 바이트만 이 스레드에서 ZIP에 기록
+    # 임시 파일에 쓴 뒤 완료되면 이름을 바꾸므로 취소하거나 실패해도 반쯤 쓴 ZIP이 남지 않음
+    temp_path = f"{zip_path}.tmp"
+    used_names = set()
+    exported, failed = 0, 0
+    total = len(photo_paths)
+    try:
+        os.makedirs(os.path.dirname(os.path.abspath(zip_path)), exist_ok=True)
+        with zipfile.ZipFile(temp_path, 'w', zipfile.ZIP_STORED, allowZip64=True) as archive:
+            if profile is None:
+                results = ((photo, None, None) for photo in takewhile(lambda _: not (should_stop and should_stop()),
+                                                                       photo_paths))
+                executor = None
+            else:
+                executor, pool_size = _export_executor(profile, workers)
+                function = partial(render_photo, **profile)
+                results = _run_windowed(executor, pool_size * 2,
+                                        ((function, (path,), (path, name)) for path, name in photo_paths), should_stop)
+            try:
+                for done, ((source_path, name), data, error) in enumerate(results, start=1):
+                    arcname = unique_name(export_name(name, profile), used_names)
+                    try:
+                        if error is not None:
+                            raise error
+                        if data is None:
+                            archive.write(source_path, arcname)
+                        else:
+                            archive.writestr(arcname, data)
+                        exported += 1
+                    except Exception as e:
+                        print(f"파일 내보내기 중 오류 발생: {e}")
+                        failed += 1
+                    if progress_callback:
+                        progress_callback(done, total)
+            finally:
+                if executor is not None:
+                    executor.shutdown()
+        if should_stop and should_stop():
+            # 취소하면 ZIP 파일이 만들어지지 않으므로 내보낸 사진도 없음
+            _remove_partial(temp_path)
+            return 0, 0
+        os.replace(temp_path, zip_path)
+    except OSError as e:
+        print(f"ZIP 파일 만들기 중 오류 발생: {e}")
+        _remove_partial(temp_path)
+        return 0, total
+    return exported, failed
+
+
+def _remove_partial(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+if __name__ == '__main__':
+    # 예) python exporter.py D:/export a.jpg b.jpg
+    exported, failed = export_photos(sys.argv[2:], sys.argv[1])
+    print(f"{exported}장 내보냄, 실패 {failed}장")
@@ -1,34 +1,33 @@
 import os
 import shutil
-from PIL import Image
-from config import RESOURCES_DIR, DEFAULT_DOWNLOAD_DIR
-from PyQt5.QtGui import QImage
+from config import (RESOURCES_DIR, APPLICATION_PATH, STORE_DIR_NAME, DEFAULT_DOWNLOAD_DIR, PHOTO_EXTENSIONS,
+                    QUICK_PREVIEW_DIVISOR)
+import profiler
 
 class FileHandler:
     def __init__(self, base_path):
         self.base_path = base_path
 
     @staticmethod
-    def save_photo(source_path, category):
-        try:
-            # 카테고리 폴더가 없으면 생성
-            category_path = os.path.join(RESOURCES_DIR, category)
-            os.makedirs(category_path, exist_ok=True)
-
-            # 파일 이름 추출 및 대상 경로 생성
-            file_name = os.path.basename(source_path)
-            destination_path = os.path.join(category_path, file_name)
-
-            # 파일 복사
-            shutil.copy2(source_path, destination_path)
+    def save_photo(source_path, category=None, store_dir=None):
+        # 내용 주소 방식 저장소에 넣음 (같은 내용은 한 번만, 가능하면 reflink)
+        # 카테고리는 데이터베이스에서만 관리하므로 저장 위치에 영향을 주지 않음
+        from photo_store import PhotoStore
 
+        try:
+            store = PhotoStore(store_dir or os.path.join(APPLICATION_PATH, STORE_DIR_NAME))
+            destination_path, _ = store.ingest(source_path)
             return destination_path
         except (FileNotFoundError, PermissionError, IOError) as e:
             print(f"파일 저장 중 오류 발생: {e}")
             return None
 
     @staticmethod
+    @profiler.timed('file.load_photo')
     def load_photo(file_path):
+        # Qt는 이미지를 실제로 불러올 때만 가져옴 (명령줄 도구는 Qt 없이 동작)
+        from PyQt5.QtGui import QImage
+
         try:
             image = QImage(file_path)
             if image.isNull():
@@ -39,14 +38,107 @@ class FileHandler:
             print(f"이미지 로드 중 오류 발생: {e}")
             return None
 
+    @staticmethod
+    @profiler.timed('file.load_preview')
+    def load_preview(file_path, width, height, thumbnail_cache=None):
+        # 미리보기 크기에 맞는 썸네일이 있으면 원본 대신 사용
+        if thumbnail_cache:
+            bucket = thumbnail_cache.bucket_for(width, height)
+            if bucket:
+                thumbnail_path = thumbnail_cache.get_thumbnail_path(file_path, bucket)
+                if thumbnail_path:
+                    image = FileHandler.load_photo(thumbnail_path)
+                    if image:
+                        return image, thumbnail_cache.original_size_from_path(thumbnail_path)
+
+        return FileHandler.load_scaled_photo(file_path, width, height)
+
+    @staticmethod
+    @profiler.timed('file.load_quick_preview')
+    def load_quick_preview(file_path, width, height):
+        # JPEG의 빠른 첫 화면: EXIF에 들어 있는 작은 썸네일, 없으면 DCT 단계 축소(draft)로 1/8까지 줄여 디코딩
+        # 이후 load_preview의 선명한 이미지로 교체되므로 화질보다 속도를 우선
+        from PyQt5.QtGui import QImage
+
+        if not file_path.lower().endswith(('.jpg', '.jpeg')):
+            return None, None
+        try:
+            from PIL import Image, UnidentifiedImageError
+        except ImportError:
+            return None, None
+
+        min_width, min_height = width // QUICK_PREVIEW_DIVISOR, height // QUICK_PREVIEW_DIVISOR
+        try:
+            with Image.open(file_path) as image:
+                original_size = image.size
+                exif_thumbnail = FileHandler._exif_thumbnail(image)
+                if exif_thumbnail:
+                    thumbnail = QImage.fromData(exif_thumbnail, 'JPG')
+                    if (not thumbnail.isNull() and thumbnail.width() >= min(min_width, original_size[0])
+                            and thumbnail.height() >= min(min_height, original_size[1])):
+                        return thumbnail, original_size
+                image.draft('RGB', (max(1, min_width), max(1, min_height)))
+                image = image.convert('RGB')
+                data = image.tobytes()
+                quick = QImage(data, image.width, image.height, image.width * 3, QImage.Format_RGB888).copy()
+                return quick, original_size
+        except (FileNotFoundError, PermissionError, IOError, UnidentifiedImageError) as e:
+            print(f"빠른 미리보기 중 오류 발생: {e}")
+            return None, None
+
+    @staticmethod
+    def _exif_thumbnail(image):
+        # APP1(Exif) 세그먼트의 IFD1에 저장된 JPEG 썸네일 바이트 (시작 위치는 TIFF 헤더 기준)
+        exif_data = image.info.get('exif')
+        if not exif_data or not exif_data.startswith(b'Exif\x00\x00'):
+            return None
+        try:
+            from PIL import ExifTags
+
+            ifd1 = image.getexif().get_ifd(ExifTags.IFD.IFD1)
+        except (AttributeError, KeyError, ValueError):
+            return None
+        offset, length = ifd1.get(0x0201), ifd1.get(0x0202)
+        if not offset or not length:
+            return None
+        return exif_data[6 + offset:6 + offset + length]
+
+    @staticmethod
+    @profiler.timed('file.load_scaled_photo')
+    def load_scaled_photo(file_path, width, height):
+        # 디코딩 단계에서 축소하여 원본 해상도 전체를 메모리에 올리지 않음
+        from PyQt5.QtCore import QSize, Qt
+        from PyQt5.QtGui import QImageReader
+
+        try:
+            reader = QImageReader(file_path)
+            original_size = reader.size()
+            if original_size.isValid() and (original_size.width() > width or original_size.height() > height):
+                reader.setScaledSize(original_size.scaled(QSize(width, height), Qt.KeepAspectRatio))
+            image = reader.read()
+            if image.isNull():
+                print(f"이미지를 불러올 수 없습니다: {file_path}")
+                return None, None
+            if not original_size.isValid():
+                original_size = image.size()
+            return image, (original_size.width(), original_size.height())
+        except Exception as e:
+            print(f"이미지 로드 중 오류 발생: {e}")
+            return None, None
+
     @staticmethod
     def download_photo(source_path, custom_name=None):
         try:
-            file_name = custom_name or os.path.basename(source_path)
+            from exporter import copy_file, unique_name
+
+            # 같은 이름의 파일이 있으면 덮어쓰지 않고 번호를 붙임
+            os.makedirs(DEFAULT_DOWNLOAD_DIR, exist_ok=True)
+            used_names = {name.lower() for name in os.listdir(DEFAULT_DOWNLOAD_DIR)}
+            file_name = unique_name(custom_name or os.path.basename(source_path), used_names)
             destination_path = os.path.join(DEFAULT_DOWNLOAD_DIR, file_name)
 
             # 파일 복사
-            shutil.copy2(source_path, destination_path)
+            copy_file(source_path, destination_path)
 
             return destination_path
         except (FileNotFoundError, PermissionError, IOError) as e:
@@ -55,13 +147,35 @@ class FileHandler:
 
     @staticmethod
     def get_photo_list(category):
+        # RESOURCES_DIR/<카테고리> 폴더에 직접 넣은 파일만 돌려줌
+        # 저장소로 가져온 사진은 카테고리 폴더에 없으므로 카테고리의 전체 사진은 Database.get_photos_page로 조회
         category_path = os.path.join(RESOURCES_DIR, category)
         try:
-            return [f for f in os.listdir(category_path) if f.lower().endswith(('.png', '.jpg', '.jpeg', '.gif', '.bmp'))]
+            return [f for f in os.listdir(category_path) if f.lower().endswith(PHOTO_EXTENSIONS)]
         except FileNotFoundError:
             print(f"카테고리 폴더를 찾을 수 없습니다: {category}")
             return []
 
+    @staticmethod
+    def iter_photo_files(sources):
+        # 파일과 폴더를 섞어 받아 하위 폴더까지 사진 경로를 하나씩 흘려보냄 (전체 목록을 만들지 않음)
+        for source in sources:
+            if os.path.isdir(source):
+                pending = [source]
+                while pending:
+                    directory = pending.pop()
+                    try:
+                        with os.scandir(directory) as entries:
+                            for entry in entries:
+                                if entry.is_dir(follow_symlinks=False):
+                                    pending.append(entry.path)
+                                elif entry.name.lower().endswith(PHOTO_EXTENSIONS):
+                                    yield entry.path
+                    except (FileNotFoundError, PermissionError) as e:
+                        print(f"폴더를 읽을 수 없습니다: {e}")
+            elif source.lower().endswith(PHOTO_EXTENSIONS):
+                yield source
+
     def copy_file(self, src_path, dest_path):
         try:
             full_dest_path = os.path.join(self.base_path, dest_path)
@@ -1,26 +1,46 @@
 import sys
 from PyQt5.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-                             QListWidget, QLabel, QPushButton, QFileDialog,
-                             QDesktopWidget, QListWidgetItem, QMessageBox, 
-                             QSpacerItem, QSizePolicy, QInputDialog, QFrame, QApplication)
-from PyQt5.QtGui import QPixmap, QImage, QPalette, QColor, QFont
-from PyQt5.QtCore import Qt, QSize, pyqtSignal, QEvent
-from slideshow import SlideShow
+                             QListWidget, QListWidgetItem, QListView, QLabel, QPushButton, QFileDialog,
+                             QDesktopWidget, QMessageBox, 
+                             QSpacerItem, QSizePolicy, QInputDialog, QFrame, QApplication,
+                             QProgressDialog, QDateEdit, QComboBox, QLineEdit, QShortcut)
+from PyQt5.QtGui import QPixmap, QImage, QPalette, QColor, QFont, QKeySequence
+from PyQt5.QtCore import Qt, QSize, pyqtSignal, QEvent, QModelIndex, QDate, QTimer
+from photo_model import PhotoListModel
+from config import GRID_THUMBNAIL_SIZE, SEARCH_DEBOUNCE_MS, EXPORT_PROFILES, PREVIEW_RESIZE_DEBOUNCE_MS
+import profiler
 
 class PhotoManagerGUI(QMainWindow):
-    photo_selected = pyqtSignal(QListWidgetItem)
+    photo_selected = pyqtSignal(QModelIndex)
+    search_requested = pyqtSignal(str)
+    preview_resized = pyqtSignal()  # 창 크기 조절이 끝나 미리보기를 새 크기로 다시 불러와야 함
     start_slideshow = pyqtSignal(list)  # 새로운 시그널 추가
 
     def __init__(self):
         super().__init__()
         self.category_list = QListWidget()
-        self.photo_list = QListWidget()
+        self.photo_list = QListView()
+        self.photo_model = PhotoListModel(self)
+        self.photo_list.setModel(self.photo_model)
+        self.photo_list.setUniformItemSizes(True)  # 행 높이를 고정하여 보이는 행만 배치 계산
+        self.photo_list.setSelectionMode(QListView.ExtendedSelection)  # Ctrl/Shift로 여러 장 선택
+        # 스크롤하면 화면 밖 행의 썸네일 대기 작업은 취소
+        self.photo_list.verticalScrollBar().valueChanged.connect(self.on_photo_list_scrolled)
         self.preview_label = QLabel()
         self.preview_label.setAlignment(Qt.AlignCenter)
         self.preview_label.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
         self.preview_label.setMinimumSize(200, 200)  # 미리보기의 최소 크기 설정
         self.initUI()
         self.slideshow = None
+        self.debug_panel = None
+        self.preview_image = None
+        self.preview_resize_timer = QTimer(self)
+        self.preview_resize_timer.setSingleShot(True)
+        self.preview_resize_timer.setInterval(PREVIEW_RESIZE_DEBOUNCE_MS)
+        self.preview_resize_timer.timeout.connect(self.preview_resized.emit)
+        # 지연 시간 측정 결과와 cProfile 분석 창
+        self.debug_shortcut = QShortcut(QKeySequence('Ctrl+Shift+D'), self)
+        self.debug_shortcut.activated.connect(self.show_debug_panel)
 
         # 이벤트 필터 추가
         self.photo_list.setMouseTracking(True)
@@ -101,9 +121,46 @@ class PhotoManagerGUI(QMainWindow):
         center_widget = QWidget()
         center_layout = QVBoxLayout()
         center_layout.addWidget(QLabel('사진파일'))
+        # 입력이 잠시 멈추면 검색 (파일 이름, 태그, 카메라, 촬영 일시)
+        self.search_edit = QLineEdit()
+        self.search_edit.setPlaceholderText('검색 (파일 이름, 태그, 카메라)')
+        self.search_edit.setClearButtonEnabled(True)
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(SEARCH_DEBOUNCE_MS)
+        self.search_timer.timeout.connect(lambda: self.search_requested.emit(self.search_edit.text().strip()))
+        self.search_edit.textChanged.connect(self.search_timer.start)
+        center_layout.addWidget(self.search_edit)
         center_layout.addWidget(self.photo_list)
         self.add_photo_btn = self.create_styled_button('사진 추가', button_style.format(bg_color=pastel_colors[3]))
-        center_layout.addWidget(self.add_photo_btn)
+        self.add_folder_btn = self.create_styled_button('폴더 추가', button_style.format(bg_color=pastel_colors[3]))
+        self.view_mode_btn = self.create_styled_button('격자 보기', button_style.format(bg_color=pastel_colors[2]))
+        self.view_mode_btn.setCheckable(True)
+        self.view_mode_btn.toggled.connect(self.set_grid_mode)
+        photo_btn_layout = QHBoxLayout()
+        photo_btn_layout.addWidget(self.view_mode_btn)
+        photo_btn_layout.addWidget(self.add_photo_btn)
+        photo_btn_layout.addWidget(self.add_folder_btn)
+        center_layout.addLayout(photo_btn_layout)
+
+        # 촬영 기간 / 카메라 검색
+        self.start_date_edit = QDateEdit(QDate.currentDate().addYears(-1))
+        self.end_date_edit = QDateEdit(QDate.currentDate())
+        for date_edit in (self.start_date_edit, self.end_date_edit):
+            date_edit.setCalendarPopup(True)
+            date_edit.setDisplayFormat('yyyy-MM-dd')
+        self.camera_combo = QComboBox()
+        self.camera_combo.addItem('모든 카메라', None)
+        self.date_search_btn = self.create_styled_button('기간 검색', button_style.format(bg_color=pastel_colors[1]))
+        date_layout = QHBoxLayout()
+        date_layout.addWidget(self.start_date_edit)
+        date_layout.addWidget(QLabel('~'))
+        date_layout.addWidget(self.end_date_edit)
+        center_layout.addLayout(date_layout)
+        camera_layout = QHBoxLayout()
+        camera_layout.addWidget(self.camera_combo, 1)
+        camera_layout.addWidget(self.date_search_btn)
+        center_layout.addLayout(camera_layout)
         center_widget.setLayout(center_layout)
 
         right_widget = QWidget()
@@ -111,7 +168,15 @@ class PhotoManagerGUI(QMainWindow):
         right_layout.addWidget(QLabel('미리보기'))
         right_layout.addWidget(self.preview_label)
         self.download_btn = self.create_styled_button('다운로드', button_style.format(bg_color=pastel_colors[4]))
-        right_layout.addWidget(self.download_btn)
+        self.tag_btn = self.create_styled_button('태그', button_style.format(bg_color=pastel_colors[1]))
+        self.export_btn = self.create_styled_button('전체 내보내기', button_style.format(bg_color=pastel_colors[3]))
+        self.move_btn = self.create_styled_button('카테고리 이동', button_style.format(bg_color=pastel_colors[2]))
+        right_btn_layout = QHBoxLayout()
+        right_btn_layout.addWidget(self.tag_btn)
+        right_btn_layout.addWidget(self.move_btn)
+        right_btn_layout.addWidget(self.download_btn)
+        right_btn_layout.addWidget(self.export_btn)
+        right_layout.addLayout(right_btn_layout)
         right_widget.setLayout(right_layout)
 
         content_layout.addWidget(left_widget)
@@ -177,9 +242,30 @@ class PhotoManagerGUI(QMainWindow):
         return None
 
     def update_category_list(self, categories):
+        # categories: get_category_stats()의 결과, 표시 문자열에는 사진 수를 붙이고 이름은 UserRole에 보관
         self.category_list.clear()
-        for category in categories:
-            self.category_list.addItem(category)
+        for stats in categories:
+            item = QListWidgetItem()
+            item.setData(Qt.UserRole, stats['name'])
+            self.set_category_item_text(item, stats)
+            self.category_list.addItem(item)
+
+    def update_category_counts(self, categories):
+        # 선택 상태를 유지한 채 사진 수만 갱신
+        stats_by_name = {stats['name']: stats for stats in categories}
+        for row in range(self.category_list.count()):
+            item = self.category_list.item(row)
+            stats = stats_by_name.get(item.data(Qt.UserRole))
+            if stats:
+                self.set_category_item_text(item, stats)
+
+    @staticmethod
+    def set_category_item_text(item, stats):
+        item.setText(f"{stats['name']} ({stats['count']})")
+        tooltip = f"{stats['count']}장, {stats['total_bytes'] / 1024 / 1024:.1f}MB"
+        if stats['first_taken_at']:
+            tooltip += f"\n{stats['first_taken_at'][:10]} ~ {stats['last_taken_at'][:10]}"
+        item.setToolTip(tooltip)
 
     def get_photo_file(self):
         file_path, _ = QFileDialog.getOpenFileName(
@@ -189,34 +275,151 @@ class PhotoManagerGUI(QMainWindow):
             'Image Files (*.png *.jpg *.jpeg *.bmp *.gif)'
         )
         return file_path
-    
-    def update_photo_list(self, photos):
-        self.photo_list.clear()
-        for photo in photos:
-            item = QListWidgetItem(photo['name'])
-            item.setData(Qt.UserRole, photo['path'])
-            self.photo_list.addItem(item)
+
+    def get_photo_files(self):
+        file_paths, _ = QFileDialog.getOpenFileNames(
+            self,
+            '사진 선택',
+            '',
+            'Image Files (*.png *.jpg *.jpeg *.bmp *.gif)'
+        )
+        return file_paths
+
+    def get_photo_folder(self):
+        return QFileDialog.getExistingDirectory(self, '사진 폴더 선택', '')
+
+    def show_import_progress(self, thread):
+        # 전체 개수를 미리 세지 않으므로 진행 막대는 무한 모드로 두고 개수만 표시
+        dialog = QProgressDialog('사진을 가져오는 중...', '취소', 0, 0, self)
+        dialog.setWindowTitle('사진 가져오기')
+        dialog.setMinimumDuration(500)
+        thread.progress.connect(lambda count: dialog.setLabelText(f"{count}장 가져오는 중..."))
+        thread.finished.connect(dialog.close)
+        dialog.canceled.connect(thread.requestInterruption)
+        return dialog
+
+    def get_target_category(self, categories, current=None):
+        categories = [category for category in categories if category != current]
+        if not categories:
+            return None
+        category, ok = QInputDialog.getItem(self, '카테고리 이동', '옮길 카테고리를 선택하세요:', categories, 0, False)
+        return category if ok else None
+
+    def get_export_target(self):
+        # (폴더, None, 프로필) 또는 (None, ZIP 파일 경로, 프로필), 취소하면 None
+        profile_name, ok = QInputDialog.getItem(self, '내보내기', '내보낼 크기를 선택하세요:',
+                                                list(EXPORT_PROFILES), 0, False)
+        if not ok:
+            return None
+        profile = EXPORT_PROFILES[profile_name]
+        formats = ['폴더로 복사', 'ZIP 파일 하나로 묶기']
+        choice, ok = QInputDialog.getItem(self, '내보내기', '내보내기 방식을 선택하세요:', formats, 0, False)
+        if not ok:
+            return None
+        if choice == formats[0]:
+            folder = QFileDialog.getExistingDirectory(self, "내보낼 폴더 선택")
+            return (folder, None, profile) if folder else None
+        zip_path, _ = QFileDialog.getSaveFileName(self, "ZIP 파일 저장", "photos.zip", "ZIP 파일 (*.zip)")
+        return (None, zip_path, profile) if zip_path else None
+
+    def show_export_progress(self, thread, total):
+        dialog = QProgressDialog('사진을 내보내는 중...', '취소', 0, total, self)
+        dialog.setWindowTitle('사진 내보내기')
+        dialog.setMinimumDuration(500)
+        thread.progress.connect(lambda done, _: dialog.setValue(done))
+        thread.finished.connect(dialog.close)
+        dialog.canceled.connect(thread.requestInterruption)
+        return dialog
+
+    def show_export_result(self, target, exported, failed):
+        message = f"사진 {exported}장을 내보냈습니다:\n{target}"
+        if failed:
+            message += f"\n(실패 {failed}장)"
+        QMessageBox.information(self, "내보내기 완료", message)
+
+    def show_export_canceled(self, target, exported):
+        message = "사진 내보내기를 취소했습니다."
+        if exported:
+            message += f"\n취소 전에 내보낸 사진 {exported}장은 남아 있습니다:\n{target}"
+        QMessageBox.information(self, "내보내기 취소", message)
+
+    @profiler.timed('gui.update_photo_list')
+    def update_photo_list(self, fetch_page):
+        # fetch_page(after, limit)로 스크롤에 맞춰 필요한 만큼만 행을 불러옴
+        self.photo_model.set_source(fetch_page)
+
+    def set_grid_mode(self, enabled):
+        if enabled:
+            self.photo_list.setViewMode(QListView.IconMode)
+            self.photo_list.setMovement(QListView.Static)
+            self.photo_list.setResizeMode(QListView.Adjust)
+            self.photo_list.setIconSize(QSize(GRID_THUMBNAIL_SIZE, GRID_THUMBNAIL_SIZE))
+            self.photo_list.setGridSize(QSize(GRID_THUMBNAIL_SIZE + 24, GRID_THUMBNAIL_SIZE + 36))
+            self.photo_list.setWordWrap(True)
+            self.view_mode_btn.setText('목록 보기')
+        else:
+            self.photo_list.setViewMode(QListView.ListMode)
+            self.photo_list.setIconSize(QSize())
+            self.photo_list.setGridSize(QSize())
+            self.view_mode_btn.setText('격자 보기')
+        self.photo_model.set_show_thumbnails(enabled)
+
+    def on_photo_list_scrolled(self, value):
+        if self.photo_model.thumbnail_loader:
+            self.photo_model.thumbnail_loader.cancel_pending()
+
+    def get_photo_tags(self, current_tags):
+        text, ok = QInputDialog.getText(self, '태그 편집', '쉼표로 구분하여 태그를 입력하세요:',
+                                        text=', '.join(current_tags))
+        if ok:
+            return [tag.strip() for tag in text.split(',') if tag.strip()]
+        return None
+
+    def update_camera_list(self, cameras):
+        current = self.camera_combo.currentData()
+        self.camera_combo.clear()
+        self.camera_combo.addItem('모든 카메라', None)
+        for camera in cameras:
+            self.camera_combo.addItem(camera, camera)
+        index = self.camera_combo.findData(current)
+        self.camera_combo.setCurrentIndex(max(index, 0))
+
+    def get_date_filter(self):
+        start = self.start_date_edit.date().toString('yyyy-MM-dd') + ' 00:00:00'
+        end = self.end_date_edit.date().toString('yyyy-MM-dd') + ' 23:59:59'
+        return start, end, self.camera_combo.currentData()
 
     def get_selected_category(self):
         selected_items = self.category_list.selectedItems()
         if selected_items:
-            return selected_items[0].text()
+            return selected_items[0].data(Qt.UserRole)
         return None
 
-    def update_preview(self, image_path):
-        pixmap = QPixmap(image_path)
-        if not pixmap.isNull():
-            scaled_pixmap = pixmap.scaled(self.preview_label.size(), Qt.KeepAspectRatio, Qt.SmoothTransformation)
-            self.preview_label.setPixmap(scaled_pixmap)
-            self.preview_label.setToolTip(f"원본 크기: {pixmap.width()}x{pixmap.height()}")
+    @profiler.timed('gui.update_preview')
+    def update_preview(self, image_path, original_size=None):
+        image = image_path if isinstance(image_path, QImage) else QImage(image_path)
+        if not image.isNull():
+            # 창 크기를 바꿀 때 이미 축소된 화면 이미지를 다시 축소하지 않도록 받은 이미지를 보관
+            self.preview_image = image
+            self.show_preview_pixmap(Qt.SmoothTransformation)
+            if original_size is None:
+                original_size = (image.width(), image.height())
+            self.preview_label.setToolTip(f"원본 크기: {original_size[0]}x{original_size[1]}")
         else:
+            self.preview_image = None
             self.preview_label.setText("이미지를 불러올 수 없습니다.")
             self.preview_label.setToolTip("")
 
+    def show_preview_pixmap(self, transformation):
+        pixmap = QPixmap.fromImage(self.preview_image)
+        self.preview_label.setPixmap(pixmap.scaled(self.preview_label.size(), Qt.KeepAspectRatio, transformation))
+
     def resizeEvent(self, event):
         super().resizeEvent(event)
-        if self.preview_label.pixmap():
-            self.update_preview(self.preview_label.pixmap().toImage())
+        # 크기를 조절하는 동안에는 가지고 있는 이미지만 다시 맞추고, 멈추면 새 크기로 다시 요청
+        if self.preview_image is not None:
+            self.show_preview_pixmap(Qt.FastTransformation)
+            self.preview_resize_timer.start()
 
     def show_download_success(self, download_path):
         QMessageBox.information(self, "다운로드 완료", f"사진이 성공적으로 다운로드되었습니다:\n{download_path}")
@@ -225,32 +428,43 @@ class PhotoManagerGUI(QMainWindow):
         QMessageBox.critical(self, "오류", message)
 
     def get_selected_photo(self):
-        selected_items = self.photo_list.selectedItems()
-        if selected_items:
-            item = selected_items[0]
-            return {
-                'path': item.data(Qt.UserRole),
-                'name': item.text()
-            }
+        selected_indexes = self.photo_list.selectionModel().selectedIndexes()
+        if selected_indexes:
+            return self.photo_model.photo_at(selected_indexes[0].row())
         return None
 
+    def get_selected_photos(self):
+        rows = sorted(index.row() for index in self.photo_list.selectionModel().selectedIndexes())
+        return [self.photo_model.photo_at(row) for row in rows]
+
     def eventFilter(self, source, event):
         if event.type() == QEvent.KeyPress and event.key() == Qt.Key_Space:
             self.start_slideshow_signal()
             return True
         elif source == self.photo_list and event.type() == QEvent.MouseMove:
-            item = self.photo_list.itemAt(event.pos())
-            if item:
-                self.photo_selected.emit(item)
+            index = self.photo_list.indexAt(event.pos())
+            if index.isValid():
+                self.photo_selected.emit(index)
         return super().eventFilter(source, event)
 
+    def show_debug_panel(self):
+        if self.debug_panel is None:
+            from debug_panel import DebugPanel
+
+            self.debug_panel = DebugPanel(self)
+        self.debug_panel.refresh()
+        self.debug_panel.show()
+        self.debug_panel.raise_()
+
     def start_slideshow_signal(self):
-        photo_paths = [self.photo_list.item(i).data(Qt.UserRole)
-                       for i in range(self.photo_list.count())]
-        self.start_slideshow.emit(photo_paths)
+        photo_paths = self.photo_model.all_paths()
+        if photo_paths:
+            self.start_slideshow.emit(photo_paths)
 
     def show_slideshow(self, photo_paths):
         if self.slideshow is None:
+            from slideshow import SlideShow
+
             self.slideshow = SlideShow(photo_paths)
             self.slideshow.closed.connect(self.on_slideshow_closed)
             self.slideshow.show()
@@ -0,0 +1,75 @@
+import os
+import threading
+from collections import OrderedDict
+from config import IMAGE_CACHE_MAX_BYTES
+
+
+class ImageCache:
+    # 디코딩/축소가 끝난 QImage를 (경로, 수정 시각, 크기, 표시 크기) 기준으로 보관하는 LRU 캐시
+    # 같은 사진을 다시 보거나 창 크기를 되돌릴 때 디스크와 디코더를 거치지 않음
+    # 백그라운드 디코딩 스레드와 GUI 스레드가 함께 사용하므로 잠금으로 보호
+    def __init__(self, max_bytes=IMAGE_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # key -> (QImage, 원본 크기, 바이트 수), 오래된 항목이 앞쪽
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def cache_key(file_path, width, height):
+        try:
+            stat_result = os.stat(file_path)
+        except OSError:
+            return None
+        return (os.path.abspath(file_path), stat_result.st_mtime_ns, stat_result.st_size, width, height)
+
+    def get(self, file_path, width, height):
+        # (QImage, 원본 크기) 또는 None
+        key = self.cache_key(file_path, width, height)
+        with self._lock:
+            entry = self._entries.get(key) if key else None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0], entry[1]
+
+    def put(self, file_path, width, height, image, original_size=None):
+        if image is None or image.isNull():
+            return
+        key = self.cache_key(file_path, width, height)
+        size = image.sizeInBytes()
+        if key is None or size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous:
+                self.total_bytes -= previous[2]
+            self._entries[key] = (image, original_size, size)
+            self.total_bytes += size
+            while self.total_bytes > self.max_bytes and self._entries:
+                _, (_, _, evicted_size) = self._entries.popitem(last=False)
+                self.total_bytes -= evicted_size
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self.total_bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+
+
+# 프로세스 전체에서 함께 쓰는 캐시
+shared_cache = ImageCache()
@@ -0,0 +1,163 @@
+import time
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal, Qt
+from PyQt5.QtGui import QImage
+from file_handler import FileHandler
+from config import PREVIEW_DECODE_THREADS, PROGRESSIVE_PREVIEW, GRID_THUMBNAIL_SIZE, GRID_THUMBNAIL_THREADS
+from image_cache import shared_cache
+import profiler
+
+
+class _LoaderSignals(QObject):
+    finished = pyqtSignal(int, str, QImage, object)
+    preview = pyqtSignal(int, str, QImage, object)  # 선명한 이미지 전에 먼저 보여줄 저해상도 이미지
+
+
+class _PreviewTask(QRunnable):
+    def __init__(self, loader, request_id, file_path, width, height):
+        super().__init__()
+        self.loader = loader
+        self.request_id = request_id
+        self.file_path = file_path
+        self.width = width
+        self.height = height
+
+    def run(self):
+        # 커서가 이미 다른 사진으로 이동했다면 디코딩하지 않음
+        if self.loader.is_stale(self.request_id):
+            return
+        if self.loader.progressive and not (self.loader.thumbnail_cache and self.loader.thumbnail_cache.has_thumbnail(
+                self.file_path, self.width, self.height)):
+            # 캐시된 썸네일이 없으면 디코딩/썸네일 생성이 끝나기 전에 저해상도 첫 화면부터 전달
+            quick_image, original_size = FileHandler.load_quick_preview(self.file_path, self.width, self.height)
+            if quick_image is not None and not self.loader.is_stale(self.request_id):
+                self.loader.signals.preview.emit(self.request_id, self.file_path, quick_image, original_size)
+        try:
+            image, original_size = FileHandler.load_preview(
+                self.file_path, self.width, self.height, self.loader.thumbnail_cache)
+            if image is None:
+                image = QImage()
+            elif image.width() > self.width or image.height() > self.height:
+                image = image.scaled(self.width, self.height, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        except Exception as e:
+            print(f"미리보기 디코딩 중 오류 발생: {e}")
+            image, original_size = QImage(), None
+        if self.loader.image_cache is not None:
+            self.loader.image_cache.put(self.file_path, self.width, self.height, image, original_size)
+        if not self.loader.is_stale(self.request_id):
+            self.loader.signals.finished.emit(self.request_id, self.file_path, image, original_size)
+
+
+class ImageLoader(QObject):
+    image_loaded = pyqtSignal(QImage, object)
+
+    def __init__(self, thumbnail_cache=None, max_threads=PREVIEW_DECODE_THREADS, progressive=PROGRESSIVE_PREVIEW,
+                 image_cache=shared_cache, parent=None):
+        super().__init__(parent)
+        self.thumbnail_cache = thumbnail_cache
+        self.image_cache = image_cache
+        self.progressive = progressive
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max_threads)
+        self.signals = _LoaderSignals()
+        self.signals.finished.connect(self._on_task_finished)
+        self.signals.preview.connect(self._on_task_preview)
+        self._latest_request = 0
+        self._latest_key = None
+        self._requested_at = 0.0
+
+    def request(self, file_path, width, height):
+        key = (file_path, width, height)
+        if key == self._latest_key:
+            return
+        self._latest_key = key
+        self._latest_request += 1
+        self._requested_at = time.perf_counter()
+        # 아직 시작하지 않은 이전 요청은 큐에서 제거
+        self.pool.clear()
+        cached = self.image_cache.get(file_path, width, height) if self.image_cache is not None else None
+        if cached:
+            # 이미 본 사진/크기는 디코딩 없이 바로 표시
+            self.image_loaded.emit(*cached)
+            profiler.record('preview.hover_latency', time.perf_counter() - self._requested_at)
+            return
+        self.pool.start(_PreviewTask(self, self._latest_request, file_path, width, height))
+
+    def current_path(self):
+        return self._latest_key[0] if self._latest_key else None
+
+    def is_stale(self, request_id):
+        return request_id != self._latest_request
+
+    def invalidate(self):
+        self._latest_key = None
+
+    def _on_task_preview(self, request_id, file_path, image, original_size):
+        if request_id == self._latest_request:
+            self.image_loaded.emit(image, original_size)
+            profiler.record('preview.first_frame_latency', time.perf_counter() - self._requested_at)
+
+    def _on_task_finished(self, request_id, file_path, image, original_size):
+        # 가장 최근 요청의 결과만 미리보기에 전달
+        if request_id == self._latest_request:
+            self.image_loaded.emit(image, original_size)
+            # 커서가 사진 위에 올라간 뒤 미리보기가 표시될 때까지의 체감 지연 시간
+            profiler.record('preview.hover_latency', time.perf_counter() - self._requested_at)
+
+    def shutdown(self):
+        self._latest_request += 1
+        self.pool.clear()
+        self.pool.waitForDone()
+
+
+class _ThumbnailSignals(QObject):
+    finished = pyqtSignal(str, QImage)
+
+
+class _ThumbnailTask(QRunnable):
+    def __init__(self, signals, thumbnail_cache, file_path, size):
+        super().__init__()
+        self.signals = signals
+        self.thumbnail_cache = thumbnail_cache
+        self.file_path = file_path
+        self.size = size
+
+    def run(self):
+        image, _ = FileHandler.load_preview(self.file_path, self.size, self.size, self.thumbnail_cache)
+        if image is None:
+            image = QImage()
+        elif image.width() > self.size or image.height() > self.size:
+            image = image.scaled(self.size, self.size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        self.signals.finished.emit(self.file_path, image)
+
+
+class ThumbnailLoader(QObject):
+    thumbnail_loaded = pyqtSignal(str, QImage)
+
+    def __init__(self, thumbnail_cache, size=GRID_THUMBNAIL_SIZE, max_threads=GRID_THUMBNAIL_THREADS, parent=None):
+        super().__init__(parent)
+        self.thumbnail_cache = thumbnail_cache
+        self.size = size
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max_threads)
+        self.pending = set()
+        self.signals = _ThumbnailSignals()
+        self.signals.finished.connect(self._on_task_finished)
+
+    def request(self, file_path):
+        if file_path in self.pending:
+            return
+        self.pending.add(file_path)
+        self.pool.start(_ThumbnailTask(self.signals, self.thumbnail_cache, file_path, self.size))
+
+    def cancel_pending(self):
+        # 스크롤로 화면에서 사라진 행의 대기 작업을 버림 (보이는 행은 다시 그릴 때 재요청됨)
+        self.pool.clear()
+        self.pending.clear()
+
+    def _on_task_finished(self, file_path, image):
+        self.pending.discard(file_path)
+        self.thumbnail_loaded.emit(file_path, image)
+
+    def shutdown(self):
+        self.cancel_pending()
+        self.pool.waitForDone()
@@ -0,0 +1,68 @@
+from PyQt5.QtCore import QThread, pyqtSignal
+from file_handler import FileHandler
+from dedupe import iter_new_photos
+from metadata import extract_missing_metadata
+from exporter import export_photos
+from photo_store import store_duplicate_policy
+from config import DUPLICATE_POLICY
+
+
+class ImportThread(QThread):
+    progress = pyqtSignal(int)  # 지금까지 추가된 사진 수
+    completed = pyqtSignal(str, int)  # 카테고리, 추가된 사진 수
+
+    def __init__(self, db, sources, category, store=None, parent=None):
+        super().__init__(parent)
+        self.db = db
+        self.sources = sources
+        self.category = category
+        self.store = store  # PhotoStore가 있으면 저장소에 넣은 뒤 저장소 경로로 등록
+
+    def run(self):
+        # Database는 스레드마다 풀에서 별도 연결을 꺼내 쓰므로 GUI 스레드의 조회와 동시에 진행 가능
+        added = 0
+        stats = {}
+        try:
+            # 해시 단계에서 이미 등록된 내용과 같은 파일은 걸러냄 (DUPLICATE_POLICY)
+            policy = store_duplicate_policy() if self.store else DUPLICATE_POLICY
+            photos = iter_new_photos(self.db, FileHandler.iter_photo_files(self.sources), policy=policy, stats=stats)
+            if self.store:
+                photos = self.store.ingest_all(photos)
+            added = self.db.add_photos(photos, self.category,
+                                       progress_callback=self.progress.emit,
+                                       should_stop=self.isInterruptionRequested)
+            # 촬영 일시/카메라 검색을 위해 EXIF 헤더만 읽어 메타데이터 저장
+            extract_missing_metadata(self.db, should_stop=self.isInterruptionRequested)
+        except Exception as e:
+            print(f"사진 가져오기 중 오류 발생: {e}")
+        finally:
+            self.db.release_connection()
+        if stats.get('duplicates'):
+            print(f"중복된 사진 {stats['duplicates']}장을 발견했습니다.")
+        self.completed.emit(self.category, added)
+
+
+class ExportThread(QThread):
+    progress = pyqtSignal(int, int)  # 처리한 사진 수, 전체 사진 수
+    completed = pyqtSignal(str, int, int)  # 내보낸 위치, 내보낸 사진 수, 실패한 사진 수
+    canceled = pyqtSignal(str, int)  # 내보낸 위치, 취소 전에 이미 내보낸 사진 수 (ZIP은 항상 0)
+
+    def __init__(self, photo_paths, destination, zip_path=None, profile=None, parent=None):
+        super().__init__(parent)
+        self.photo_paths = photo_paths
+        self.destination = destination
+        self.zip_path = zip_path
+        self.profile = profile  # None이면 원본 복사, 아니면 크기 변환 (config.EXPORT_PROFILES)
+
+    def run(self):
+        exported, failed = 0, 0
+        try:
+            exported, failed = export_photos(self.photo_paths, self.destination, self.zip_path, self.profile,
+                                             progress_callback=self.progress.emit,
+                                             should_stop=self.isInterruptionRequested)
+        except Exception as e:
+            print(f"사진 내보내기 중 오류 발생: {e}")
+        if self.isInterruptionRequested():
+            self.canceled.emit(self.zip_path or self.destination, exported)
+            return
+        self.completed.emit(self.zip_path or self.destination, exported, failed)
@@ -1,52 +1,93 @@
+import time
+STARTUP_TIME = time.perf_counter()  # 다른 모듈을 불러오기 전에 시작 시각 기록
+
 import sys
 import os
-from PyQt5.QtWidgets import QApplication, QMessageBox, QInputDialog
+import multiprocessing
+from PyQt5.QtWidgets import QApplication, QMessageBox, QInputDialog, QListView
 from PyQt5.QtGui import QIcon
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QTimer
 from gui import PhotoManagerGUI
 from database import Database
 from file_handler import FileHandler
-from slideshow import SlideShow  # SlideShow 클래스 추가
-
-# 실행 파일 또는 스크립트의 디렉토리 경로 얻기
-if getattr(sys, 'frozen', False):
-    # 실행 파일로 실행될 때
-    application_path = os.path.dirname(sys.executable)
-else:
-    # 스크립트로 실행될 때
-    application_path = os.path.dirname(os.path.abspath(__file__))
-
-# 데이터베이스 파일 경로 설정
-DATABASE_PATH = os.path.join(application_path, 'photo_manager.db')
+from thumbnail_cache import ThumbnailCache
+from image_loader import ImageLoader, ThumbnailLoader
+from config import THUMBNAIL_DIR_NAME, TILE_DIR_NAME, STORE_DIR_NAME, IMPORT_INTO_STORE, APPLICATION_PATH, DATABASE_PATH, DEFAULT_DOWNLOAD_DIR, PROFILE_DUMP_PATH
+import profiler
 
 class PhotoManager:
     def __init__(self, db_path):
+        # 창을 먼저 띄울 수 있도록 여기서는 화면 구성만 하고 데이터베이스 작업은 start()에서 수행
+        self.db_path = db_path
+        self.import_thread = None
+        self.export_thread = None
+        self.tile_viewer = None
+        self.pyramid_builder = None
+        self.watcher = None
         self.db = Database(db_path)
-        self.db.connect()
-        if not os.path.exists(db_path):
-            self.db.initialize_database()  # 데이터베이스 초기화
         self.file_handler = FileHandler(os.path.dirname(db_path))
+        self.thumbnail_cache = ThumbnailCache(os.path.join(os.path.dirname(db_path), THUMBNAIL_DIR_NAME))
         self.gui = PhotoManagerGUI()
+        self.image_loader = ImageLoader(self.thumbnail_cache)
+        self.thumbnail_loader = ThumbnailLoader(self.thumbnail_cache)
+        self.gui.photo_model.set_thumbnail_loader(self.thumbnail_loader)
         self.setup_connections()
+
+    def start(self):
+        # 첫 화면이 그려진 뒤 호출: 데이터베이스 연결/업그레이드, 폴더 감시, 카테고리 로드
+        from watcher import LibraryWatcher
+
+        is_new_database = not os.path.exists(self.db_path)
+        self.db.connect()
+        if is_new_database:
+            self.db.initialize_database()  # 데이터베이스 초기화
+        self.watcher = LibraryWatcher(self.db)
+        self.watcher.library_changed.connect(self.on_library_changed)
         self.load_categories()  # 카테고리 로드
 
+    def shutdown(self):
+        self.image_loader.shutdown()
+        self.thumbnail_loader.shutdown()
+        if self.pyramid_builder:
+            self.pyramid_builder.shutdown()
+        if self.watcher:
+            self.watcher.stop()
+        if PROFILE_DUMP_PATH:
+            profiler.dump(PROFILE_DUMP_PATH)
+
     def setup_connections(self):
         self.gui.add_category_btn.clicked.connect(self.add_category)
         self.gui.edit_category_btn.clicked.connect(self.edit_category)
         self.gui.delete_category_btn.clicked.connect(self.delete_category)
         self.gui.add_photo_btn.clicked.connect(self.add_photo)
+        self.gui.add_folder_btn.clicked.connect(self.add_photo_folder)
         self.gui.download_btn.clicked.connect(self.download_photo)
+        self.gui.export_btn.clicked.connect(self.export_photo_list)
         self.gui.category_list.itemClicked.connect(self.load_category_photos)
-        self.gui.photo_list.itemClicked.connect(self.show_photo_preview)
-        self.gui.photo_list.itemEntered.connect(self.show_photo_preview)  # 커서가 파일 위에 올 때
-        self.gui.photo_list.currentItemChanged.connect(self.show_photo_preview)  # 키보드 상/하 화살표
+        self.gui.date_search_btn.clicked.connect(self.search_by_date)
+        self.gui.search_requested.connect(self.search_photos)
+        self.gui.tag_btn.clicked.connect(self.edit_photo_tags)
+        self.gui.move_btn.clicked.connect(self.move_photos)
+        self.gui.photo_list.clicked.connect(self.show_photo_preview)
+        self.gui.photo_list.entered.connect(self.show_photo_preview)  # 커서가 파일 위에 올 때
+        self.gui.photo_list.selectionModel().currentChanged.connect(self.show_photo_preview)  # 키보드 상/하 화살표
+        self.image_loader.image_loaded.connect(self.gui.update_preview)
+        self.gui.preview_resized.connect(self.refresh_preview)
+        self.gui.start_slideshow.connect(self.gui.show_slideshow)
+        self.gui.photo_list.doubleClicked.connect(self.open_tile_viewer)  # 큰 사진 확대 보기
 
         # 스페이스바로 슬라이드쇼 시작
         self.gui.photo_list.keyPressEvent = self.keyPressEvent
 
     def load_categories(self):
-        categories = self.db.get_categories()
-        self.gui.update_category_list(categories)
+        # 사진 수는 트리거로 유지되는 요약 테이블에서 읽으므로 사진이 많아도 바로 표시됨
+        self.gui.update_category_list(self.db.get_category_stats())
+        self.gui.update_camera_list(self.db.get_cameras())
+        if self.watcher:
+            self.watcher.refresh()  # 카테고리 폴더 감시 목록 갱신
+
+    def refresh_category_counts(self):
+        self.gui.update_category_counts(self.db.get_category_stats())
 
     def add_category(self):
         category_name, ok = QInputDialog.getText(self.gui, '카테고리 추가', '새 카테고리 이름을 입력하세요:')
@@ -72,17 +113,52 @@ class PhotoManager:
                 self.load_categories()
 
     def add_photo(self):
-        file_path = self.gui.get_photo_file()  # GUI에서 파일 선택
+        file_paths = self.gui.get_photo_files()  # GUI에서 파일 여러 개 선택
         category = self.gui.get_selected_category()  # GUI에서 선택된 카테고리 가져오기
-        if file_path and category:
-            self.db.add_photo(file_path, category)
-            photos = self.db.get_photos_by_category(category)  # 카테고리의 모든 사진 가져오기
-            self.gui.update_photo_list(photos)  # 사진 목록 업데이트
+        if file_paths and category:
+            self.import_photos(file_paths, category)
+
+    def add_photo_folder(self):
+        category = self.gui.get_selected_category()
+        if not category:
+            self.gui.show_error("사진을 추가할 카테고리를 선택해주세요.")
+            return
+        folder_path = self.gui.get_photo_folder()
+        if folder_path:
+            self.import_photos([folder_path], category)
+
+    def import_photos(self, sources, category):
+        from importer import ImportThread
+
+        if self.import_thread and self.import_thread.isRunning():
+            self.gui.show_error("이미 사진을 가져오는 중입니다.")
+            return
+        store = None
+        if IMPORT_INTO_STORE:
+            from photo_store import PhotoStore
+
+            store = PhotoStore(os.path.join(os.path.dirname(self.db_path), STORE_DIR_NAME))
+        # 가져오기는 별도 스레드에서 진행하고 완료 시 한 번만 목록을 갱신
+        self.import_thread = ImportThread(self.db, sources, category, store)
+        self.import_thread.completed.connect(self.on_import_completed)
+        self.import_progress = self.gui.show_import_progress(self.import_thread)
+        self.import_thread.start()
+
+    def on_import_completed(self, category, added):
+        self.gui.update_camera_list(self.db.get_cameras())
+        self.refresh_category_counts()
+        if category == self.gui.get_selected_category():
+            self.gui.update_photo_list(self.photo_source(category))  # 사진 목록 업데이트
 
     def download_photo(self):
+        selected_photos = self.gui.get_selected_photos()
+        if len(selected_photos) > 1:
+            # 여러 장을 선택하면 다운로드 폴더로 한꺼번에 복사
+            self.export_photos([(photo['path'], photo['name']) for photo in selected_photos], DEFAULT_DOWNLOAD_DIR)
+            return
         selected_photo = self.gui.get_selected_photo()  # GUI에서 선택된 사진 정보 가져오기
         if selected_photo:
-            download_path = self.file_handler.download_photo(selected_photo['path'])
+            download_path = self.file_handler.download_photo(selected_photo['path'], selected_photo['name'])
             if download_path:
                 self.gui.show_download_success(download_path)
             else:
@@ -90,33 +166,144 @@ class PhotoManager:
         else:
             self.gui.show_error("다운로드할 사진을 선택해주세요.")
 
+    def export_photo_list(self):
+        # 지금 보고 있는 목록 전체 (카테고리, 검색 결과 또는 기간 검색 결과)
+        photo_paths = self.gui.photo_model.all_photos()
+        if not photo_paths:
+            self.gui.show_error("내보낼 사진이 없습니다.")
+            return
+        target = self.gui.get_export_target()
+        if target:
+            self.export_photos(photo_paths, *target)
+
+    def export_photos(self, photo_paths, destination, zip_path=None, profile=None):
+        from importer import ExportThread
+
+        if self.export_thread and self.export_thread.isRunning():
+            self.gui.show_error("이미 사진을 내보내는 중입니다.")
+            return
+        self.export_thread = ExportThread(photo_paths, destination, zip_path, profile)
+        self.export_thread.completed.connect(self.gui.show_export_result)
+        self.export_thread.canceled.connect(self.gui.show_export_canceled)
+        self.export_progress = self.gui.show_export_progress(self.export_thread, len(photo_paths))
+        self.export_thread.start()
+
     def load_category_photos(self, category_item):
-        category_name = category_item.text()
-        photos = self.db.get_photos_by_category(category_name)
-        self.gui.update_photo_list(photos)
+        category_name = category_item.data(Qt.UserRole)
+        self.gui.update_photo_list(self.photo_source(category_name))
+
+    def photo_source(self, category_name):
+        # 목록 모델이 스크롤에 맞춰 호출하는 페이지 조회 함수
+        return lambda after_id, limit: self.db.get_photos_page(category_name, after_id, limit)
+
+    def on_library_changed(self, categories):
+        # 감시 중인 폴더에 파일이 생기거나 사라지면 사진 수와 보고 있는 카테고리 목록만 다시 불러옴
+        self.refresh_category_counts()
+        category = self.gui.get_selected_category()
+        if category in categories:
+            self.gui.update_photo_list(self.photo_source(category))
 
-    def show_photo_preview(self, photo_item):
-        if photo_item:
-            photo_path = photo_item.data(Qt.UserRole)  # 사진 경로 가져오기
+    def search_photos(self, text):
+        # 라이브러리 전체에서 검색하고, 검색어가 비면 선택된 카테고리 목록으로 돌아감
+        if not text:
+            category = self.gui.get_selected_category()
+            self.gui.update_photo_list(self.photo_source(category) if category else None)
+            return
+        self.gui.update_photo_list(lambda after_id, limit: self.db.search_photos(text, None, after_id, limit))
+
+    def edit_photo_tags(self):
+        selected_photo = self.gui.get_selected_photo()
+        if not selected_photo:
+            self.gui.show_error("태그를 편집할 사진을 선택해주세요.")
+            return
+        tags = self.gui.get_photo_tags(self.db.get_photo_tags(selected_photo['id']))
+        if tags is not None and not self.db.set_photo_tags(selected_photo['id'], tags):
+            self.gui.show_error("태그 저장에 실패했습니다.")
+
+    def move_photos(self):
+        # 파일은 그대로 두고 데이터베이스의 카테고리만 바꿈
+        selected_photos = self.gui.get_selected_photos()
+        if not selected_photos:
+            self.gui.show_error("이동할 사진을 선택해주세요.")
+            return
+        category = self.gui.get_target_category(self.db.get_categories(), self.gui.get_selected_category())
+        if not category:
+            return
+        if not self.db.move_photos([photo['id'] for photo in selected_photos], category):
+            self.gui.show_error("사진 이동에 실패했습니다.")
+            return
+        self.refresh_category_counts()
+        current = self.gui.get_selected_category()
+        if current:
+            self.gui.update_photo_list(self.photo_source(current))
+
+    def search_by_date(self):
+        # 선택된 카테고리가 있으면 그 안에서, 없으면 전체 사진에서 촬영 기간으로 검색
+        start, end, camera = self.gui.get_date_filter()
+        category = self.gui.get_selected_category()
+        self.gui.update_photo_list(
+            lambda after, limit: self.db.get_photos_by_date_range(start, end, category, camera, after, limit))
+
+    def show_photo_preview(self, photo_index, previous_index=None):
+        if photo_index is not None and photo_index.isValid():
+            photo_path = photo_index.data(Qt.UserRole)  # 사진 경로 가져오기
             if photo_path:
-                preview_image = self.file_handler.load_photo(photo_path)
-                if preview_image:
-                    self.gui.update_preview(preview_image)
+                # 디코딩은 백그라운드에서 수행하고 최신 결과만 update_preview로 전달
+                preview_size = self.gui.preview_label.size()
+                self.image_loader.request(photo_path, preview_size.width(), preview_size.height())
+
+    def refresh_preview(self):
+        # 마지막으로 보던 사진을 새 미리보기 크기로 다시 요청 (이전에 본 크기면 이미지 캐시에서 바로 표시)
+        photo_path = self.image_loader.current_path()
+        if photo_path:
+            preview_size = self.gui.preview_label.size()
+            self.image_loader.request(photo_path, preview_size.width(), preview_size.height())
+
+    def open_tile_viewer(self, photo_index):
+        # 타일 피라미드로 보이는 부분만 읽으므로 수만 픽셀 크기의 파노라마/스캔도 메모리 걱정 없이 확대 가능
+        from tile_viewer import TileViewer, PyramidBuilder
+
+        photo_path = photo_index.data(Qt.UserRole)
+        if not photo_path:
+            return
+        if self.tile_viewer:
+            self.tile_viewer.close()
+        if self.pyramid_builder is None:
+            # 보기 창마다 스레드 풀을 만들면 창을 바꿀 때 이전 창의 풀이 진행 중인 생성을 기다리느라 화면이 멈춤
+            self.pyramid_builder = PyramidBuilder(os.path.join(os.path.dirname(self.db_path), TILE_DIR_NAME))
+        self.tile_viewer = TileViewer(photo_path, self.pyramid_builder)
+        self.tile_viewer.showFullScreen()
 
     def keyPressEvent(self, event):
         if event.key() == Qt.Key_Space:
-            photo_paths = [self.gui.photo_list.item(i).data(Qt.UserRole)
-                           for i in range(self.gui.photo_list.count())]
+            photo_paths = self.gui.photo_model.all_paths()
             if photo_paths:
+                from slideshow import SlideShow
+
                 self.slideshow = SlideShow(photo_paths)
-                self.slideshow.exec_()
+                self.slideshow.show()
+        else:
+            # 상/하 화살표 등 기본 목록 동작은 그대로 유지
+            QListView.keyPressEvent(self.gui.photo_list, event)
 
 def main():
     app = QApplication(sys.argv)
-    app.setWindowIcon(QIcon(os.path.join(application_path, 'photos.ico')))  # 아이콘 설정
+    app.setWindowIcon(QIcon(os.path.join(APPLICATION_PATH, 'photos.ico')))  # 아이콘 설정
     photo_manager = PhotoManager(DATABASE_PATH)
+    app.aboutToQuit.connect(photo_manager.shutdown)
     photo_manager.gui.show()
+    app.processEvents()  # 첫 화면을 바로 그림
+    first_window_time = time.perf_counter()
+
+    def deferred_start():
+        photo_manager.start()
+        ready_time = time.perf_counter()
+        profiler.record('startup.first_window', first_window_time - STARTUP_TIME)
+        profiler.record('startup.ready', ready_time - STARTUP_TIME)
+
+    QTimer.singleShot(0, deferred_start)
     sys.exit(app.exec_())
 
 if __name__ == '__main__':
+    multiprocessing.freeze_support()  # PyInstaller 실행 파일에서 해시 계산용 프로세스 풀 사용
     main()
@@ -0,0 +1,79 @@
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from config import HASH_WORKERS, IMPORT_BATCH_SIZE
+
+EXIF_IFD = 0x8769
+TAG_MAKE = 0x010F
+TAG_MODEL = 0x0110
+TAG_ORIENTATION = 0x0112
+TAG_DATETIME = 0x0132
+TAG_DATETIME_ORIGINAL = 0x9003
+
+
+def _exif_datetime(value):
+    # EXIF 'YYYY:MM:DD HH:MM:SS' -> 정렬 가능한 'YYYY-MM-DD HH:MM:SS'
+    if not isinstance(value, str) or len(value) < 19:
+        return None
+    value = value.strip('\x00 ')[:19]
+    if value.startswith('0000'):
+        return None
+    return value[:10].replace(':', '-') + value[10:]
+
+
+def _exif_text(value):
+    if isinstance(value, bytes):
+        value = value.decode('utf-8', errors='ignore')
+    if isinstance(value, str):
+        value = value.strip('\x00 ')
+    return value or None
+
+
+def read_metadata(file_path):
+    # Image.open은 헤더만 읽으므로 픽셀 데이터를 디코딩하지 않고 크기와 EXIF를 얻을 수 있음
+    from PIL import Image, UnidentifiedImageError
+
+    try:
+        with Image.open(file_path) as image:
+            width, height = image.size
+            exif = image.getexif()
+            exif_ifd = exif.get_ifd(EXIF_IFD)
+    except (FileNotFoundError, PermissionError, IOError, UnidentifiedImageError) as e:
+        print(f"메타데이터 읽기 중 오류 발생: {e}")
+        return None
+
+    make = _exif_text(exif.get(TAG_MAKE))
+    model = _exif_text(exif.get(TAG_MODEL))
+    if make and model and not model.startswith(make):
+        camera = f"{make} {model}"
+    else:
+        camera = model or make
+    orientation = exif.get(TAG_ORIENTATION)
+    return {
+        'width': width,
+        'height': height,
+        'taken_at': _exif_datetime(exif_ifd.get(TAG_DATETIME_ORIGINAL)) or _exif_datetime(exif.get(TAG_DATETIME)),
+        'camera': camera,
+        'orientation': orientation if isinstance(orientation, int) else None,
+    }
+
+
+# 헤더를 읽을 수 없는 파일에 저장하는 값: width = 0이면 추출을 시도했다는 표시
+UNREADABLE_METADATA = {'width': 0, 'height': 0, 'taken_at': None, 'camera': None, 'orientation': None}
+
+
+def extract_missing_metadata(db, batch_size=IMPORT_BATCH_SIZE, should_stop=None):
+    # 메타데이터가 없는 사진만 프로세스 풀에서 읽어 batch_size 단위로 저장
+    extracted = 0
+    photos = iter(list(db.iter_photos_missing_metadata()))
+    with ProcessPoolExecutor(max_workers=HASH_WORKERS) as executor:
+        while not (should_stop and should_stop()):
+            batch = list(islice(photos, batch_size))
+            if not batch:
+                break
+            chunksize = max(1, len(batch) // 64)
+            results = executor.map(read_metadata, [path for _, path in batch], chunksize=chunksize)
+            rows = [dict(metadata or UNREADABLE_METADATA, id=photo_id)
+                    for (photo_id, _), metadata in zip(batch, results)]
+            db.set_photo_metadata(rows)
+            extracted += sum(1 for row in rows if row['width'])
+    return extracted
@@ -0,0 +1,217 @@
+import sqlite3
+
+# 스키마 버전은 PRAGMA user_version에 저장되며, MIGRATIONS[i]를 적용하면 버전이 i + 1이 됨
+# 기존 마이그레이션은 수정하지 말고 항상 목록 끝에 새 마이그레이션을 추가할 것
+
+
+def _initial_schema(cursor):
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS categories (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL UNIQUE
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS photos (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            path TEXT NOT NULL,
+            name TEXT NOT NULL,
+            category_id INTEGER,
+            FOREIGN KEY (category_id) REFERENCES categories (id)
+        )
+    ''')
+
+
+def _photo_indexes_and_metadata(cursor):
+    # 고유 인덱스를 만들기 전에 같은 경로로 중복 등록된 행을 정리 (가장 먼저 추가된 행을 유지)
+    cursor.execute("DELETE FROM photos WHERE id NOT IN (SELECT MIN(id) FROM photos GROUP BY path)")
+    cursor.execute("ALTER TABLE photos ADD COLUMN file_size INTEGER")
+    cursor.execute("ALTER TABLE photos ADD COLUMN mtime_ns INTEGER")
+    cursor.execute("ALTER TABLE photos ADD COLUMN width INTEGER")
+    cursor.execute("ALTER TABLE photos ADD COLUMN height INTEGER")
+    cursor.execute("ALTER TABLE photos ADD COLUMN taken_at TEXT")  # 'YYYY-MM-DD HH:MM:SS'
+    cursor.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_photos_path ON photos (path)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_photos_category ON photos (category_id, id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_photos_taken_at ON photos (taken_at)")
+
+
+def _content_hash(cursor):
+    cursor.execute("ALTER TABLE photos ADD COLUMN content_hash TEXT")  # SHA-256 hex
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_photos_content_hash ON photos (content_hash)")
+
+
+def _perceptual_hash(cursor):
+    cursor.execute("ALTER TABLE photos ADD COLUMN phash INTEGER")  # 64비트 dHash (부호 있는 정수로 저장)
+
+
+def _exif_metadata(cursor):
+    cursor.execute("ALTER TABLE photos ADD COLUMN camera TEXT")
+    cursor.execute("ALTER TABLE photos ADD COLUMN orientation INTEGER")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_photos_camera ON photos (camera, taken_at)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_photos_category_taken_at ON photos (category_id, taken_at)")
+
+
+def _tags_and_search(cursor):
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS tags (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL UNIQUE
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS photo_tags (
+            photo_id INTEGER NOT NULL,
+            tag_id INTEGER NOT NULL,
+            PRIMARY KEY (photo_id, tag_id)
+        ) WITHOUT ROWID
+    ''')
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_photo_tags_tag ON photo_tags (tag_id, photo_id)")
+
+    # 파일 이름, 태그, 메타데이터 전문 검색 색인 (rowid = photos.id), 트리거로 photos/photo_tags와 동기화
+    cursor.execute("CREATE VIRTUAL TABLE IF NOT EXISTS photos_fts USING fts5(name, tags, metadata, prefix='2 3')")
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS photos_fts_insert AFTER INSERT ON photos BEGIN
+            INSERT INTO photos_fts (rowid, name, tags, metadata)
+            VALUES (new.id, new.name, '', trim(coalesce(new.camera, '') || ' ' || coalesce(new.taken_at, '')));
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS photos_fts_update AFTER UPDATE OF name, camera, taken_at ON photos BEGIN
+            UPDATE photos_fts
+            SET name = new.name,
+                metadata = trim(coalesce(new.camera, '') || ' ' || coalesce(new.taken_at, ''))
+            WHERE rowid = new.id;
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS photos_fts_delete AFTER DELETE ON photos BEGIN
+            DELETE FROM photos_fts WHERE rowid = old.id;
+            DELETE FROM photo_tags WHERE photo_id = old.id;
+        END
+    ''')
+    for event, row in (('INSERT', 'new'), ('DELETE', 'old')):
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS photo_tags_fts_{event.lower()} AFTER {event} ON photo_tags BEGIN
+                UPDATE photos_fts
+                SET tags = coalesce((SELECT group_concat(tags.name, ' ')
+                                     FROM photo_tags JOIN tags ON tags.id = photo_tags.tag_id
+                                     WHERE photo_tags.photo_id = {row}.photo_id), '')
+                WHERE rowid = {row}.photo_id;
+            END
+        ''')
+    cursor.execute('''
+        INSERT INTO photos_fts (rowid, name, tags, metadata)
+        SELECT id, name, '', trim(coalesce(camera, '') || ' ' || coalesce(taken_at, '')) FROM photos
+    ''')
+
+
+def _category_stats(cursor):
+    # 카테고리별 사진 수/전체 크기/촬영 기간 요약 테이블: photos가 바뀌는 같은 트랜잭션 안에서 트리거로 갱신
+    # 촬영 기간의 최솟값/최댓값은 삭제나 이동 시 idx_photos_category_taken_at으로 해당 카테고리만 다시 구함
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS category_stats (
+            category_id INTEGER PRIMARY KEY,
+            photo_count INTEGER NOT NULL DEFAULT 0,
+            total_bytes INTEGER NOT NULL DEFAULT 0,
+            first_taken_at TEXT,
+            last_taken_at TEXT
+        )
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS categories_stats_insert AFTER INSERT ON categories BEGIN
+            INSERT OR IGNORE INTO category_stats (category_id) VALUES (new.id);
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS categories_stats_delete AFTER DELETE ON categories BEGIN
+            DELETE FROM category_stats WHERE category_id = old.id;
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS photos_stats_insert AFTER INSERT ON photos BEGIN
+            UPDATE category_stats
+            SET photo_count = photo_count + 1,
+                total_bytes = total_bytes + coalesce(new.file_size, 0),
+                first_taken_at = CASE WHEN new.taken_at IS NOT NULL
+                                           AND (first_taken_at IS NULL OR new.taken_at < first_taken_at)
+                                      THEN new.taken_at ELSE first_taken_at END,
+                last_taken_at = CASE WHEN new.taken_at IS NOT NULL
+                                          AND (last_taken_at IS NULL OR new.taken_at > last_taken_at)
+                                     THEN new.taken_at ELSE last_taken_at END
+            WHERE category_id = new.category_id;
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS photos_stats_delete AFTER DELETE ON photos BEGIN
+            UPDATE category_stats
+            SET photo_count = photo_count - 1,
+                total_bytes = total_bytes - coalesce(old.file_size, 0),
+                first_taken_at = (SELECT MIN(taken_at) FROM photos WHERE category_id = old.category_id),
+                last_taken_at = (SELECT MAX(taken_at) FROM photos WHERE category_id = old.category_id)
+            WHERE category_id = old.category_id;
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS photos_stats_update
+        AFTER UPDATE OF category_id, file_size, taken_at ON photos BEGIN
+            UPDATE category_stats
+            SET photo_count = photo_count - 1,
+                total_bytes = total_bytes - coalesce(old.file_size, 0)
+            WHERE category_id = old.category_id;
+            UPDATE category_stats
+            SET photo_count = photo_count + 1,
+                total_bytes = total_bytes + coalesce(new.file_size, 0)
+            WHERE category_id = new.category_id;
+            UPDATE category_stats
+            SET first_taken_at = (SELECT MIN(taken_at) FROM photos WHERE photos.category_id = category_stats.category_id),
+                last_taken_at = (SELECT MAX(taken_at) FROM photos WHERE photos.category_id = category_stats.category_id)
+            WHERE category_id IN (old.category_id, new.category_id);
+        END
+    ''')
+    cursor.execute('''
+        INSERT OR REPLACE INTO category_stats (category_id, photo_count, total_bytes, first_taken_at, last_taken_at)
+        SELECT categories.id, COUNT(photos.id), COALESCE(SUM(photos.file_size), 0),
+               MIN(photos.taken_at), MAX(photos.taken_at)
+        FROM categories
+        LEFT JOIN photos ON photos.category_id = categories.id
+        GROUP BY categories.id
+    ''')
+
+
+MIGRATIONS = [
+    _initial_schema,
+    _photo_indexes_and_metadata,
+    _content_hash,
+    _perceptual_hash,
+    _exif_metadata,
+    _tags_and_search,
+    _category_stats,
+]
+
+SCHEMA_VERSION = len(MIGRATIONS)
+
+
+def get_schema_version(conn):
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(conn):
+    version = get_schema_version(conn)
+    if version > SCHEMA_VERSION:
+        raise sqlite3.DatabaseError(
+            f"데이터베이스 스키마 버전({version})이 프로그램이 지원하는 버전({SCHEMA_VERSION})보다 높습니다.")
+
+    for index in range(version, SCHEMA_VERSION):
+        # 마이그레이션 하나를 하나의 트랜잭션으로 적용하여 중간에 실패해도 이전 상태로 남도록 함
+        cursor = conn.cursor()
+        try:
+            cursor.execute("BEGIN")
+            MIGRATIONS[index](cursor)
+            cursor.execute(f"PRAGMA user_version = {index + 1}")
+            conn.commit()
+        except sqlite3.Error:
+            conn.rollback()
+            raise
+        finally:
+            cursor.close()
+    return SCHEMA_VERSION
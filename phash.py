@@ -0,0 +1,170 @@
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from config import HASH_WORKERS, IMPORT_BATCH_SIZE, NEAR_DUPLICATE_THRESHOLD
+
+HASH_SIZE = 8  # 8x8 = 64비트
+
+
+def dhash(file_path):
+    # 9x8 흑백으로 줄인 뒤 가로로 이웃한 픽셀의 밝기 비교 결과를 64비트 정수로 만듦
+    from PIL import Image, UnidentifiedImageError
+
+    try:
+        with Image.open(file_path) as image:
+            image.draft('L', (HASH_SIZE * 8, HASH_SIZE * 8))  # JPEG은 축소 디코딩
+            pixels = list(image.convert('L').resize((HASH_SIZE + 1, HASH_SIZE), Image.LANCZOS).getdata())
+    except (FileNotFoundError, PermissionError, IOError, UnidentifiedImageError) as e:
+        print(f"유사도 해시 계산 중 오류 발생: {e}")
+        return None
+
+    value = 0
+    for row in range(HASH_SIZE):
+        offset = row * (HASH_SIZE + 1)
+        for col in range(HASH_SIZE):
+            value = (value << 1) | (pixels[offset + col] < pixels[offset + col + 1])
+    return value
+
+
+def to_signed(value):
+    # SQLite INTEGER는 부호 있는 64비트이므로 상위 비트가 켜진 해시는 음수로 저장
+    return value - (1 << 64) if value >= (1 << 63) else value
+
+
+def to_unsigned(value):
+    return value + (1 << 64) if value < 0 else value
+
+
+if hasattr(int, 'bit_count'):  # Python 3.10+
+    def hamming_distance(a, b):
+        return (a ^ b).bit_count()
+else:
+    def hamming_distance(a, b):
+        return bin(a ^ b).count('1')
+
+
+class HammingIndex:
+    # 64비트 해시를 16비트 블록 4개로 나눈 다중 인덱스 해싱:
+    # 해밍 거리가 radius 이하인 두 해시는 비둘기집 원리에 따라 적어도 한 블록의 거리가 radius // 4 이하이므로
+    # 각 블록에서 그 범위의 변형만 사전으로 찾아보면 전체 쌍 비교(O(n²)) 없이 후보를 얻을 수 있음
+    BLOCKS = 4
+    BLOCK_BITS = 16
+
+    def __init__(self):
+        self.tables = [{} for _ in range(self.BLOCKS)]
+        self.hashes = {}
+        self._mask_cache = {}
+
+    def _blocks(self, value):
+        mask = (1 << self.BLOCK_BITS) - 1
+        return [(value >> (block * self.BLOCK_BITS)) & mask for block in range(self.BLOCKS)]
+
+    def add(self, value, item):
+        self.hashes[item] = value
+        for table, key in zip(self.tables, self._blocks(value)):
+            table.setdefault(key, []).append(item)
+
+    def _masks(self, radius):
+        # 블록 안에서 radius개 이하의 비트를 뒤집는 XOR 마스크 목록 (radius별로 한 번만 계산)
+        masks = self._mask_cache.get(radius)
+        if masks is None:
+            masks = [0]
+            frontier = [(0, -1)]
+            for _ in range(radius):
+                next_frontier = []
+                for mask, last_bit in frontier:
+                    for bit in range(last_bit + 1, self.BLOCK_BITS):
+                        next_frontier.append((mask | (1 << bit), bit))
+                masks.extend(mask for mask, _ in next_frontier)
+                frontier = next_frontier
+            self._mask_cache[radius] = masks
+        return masks
+
+    def search(self, value, radius):
+        masks = self._masks(radius // self.BLOCKS)
+        candidates = set()
+        for table, key in zip(self.tables, self._blocks(value)):
+            get = table.get
+            for mask in masks:
+                bucket = get(key ^ mask)
+                if bucket:
+                    candidates.update(bucket)
+        results = []
+        for item in candidates:
+            distance = hamming_distance(value, self.hashes[item])
+            if distance <= radius:
+                results.append((distance, item))
+        return results
+
+
+def compute_missing_phashes(db, batch_size=IMPORT_BATCH_SIZE):
+    # 아직 해시가 없는 사진만 프로세스 풀에서 계산하여 batch_size 단위로 저장
+    computed = 0
+    photos = iter(list(db.iter_photos_missing_phash()))
+    with ProcessPoolExecutor(max_workers=HASH_WORKERS) as executor:
+        while True:
+            batch = list(islice(photos, batch_size))
+            if not batch:
+                break
+            chunksize = max(1, len(batch) // 64)
+            hashes = executor.map(dhash, [path for _, path in batch], chunksize=chunksize)
+            pairs = [(photo_id, to_signed(value))
+                     for (photo_id, _), value in zip(batch, hashes) if value is not None]
+            db.set_phashes(pairs)
+            computed += len(pairs)
+    return computed
+
+
+def find_near_duplicates(db, threshold=NEAR_DUPLICATE_THRESHOLD):
+    compute_missing_phashes(db)
+
+    index = HammingIndex()
+    for photo_id, value in db.iter_phashes():
+        index.add(to_unsigned(value), photo_id)
+
+    # 서로 threshold 이내인 사진을 union-find로 묶음
+    parent = {}
+
+    def find(photo_id):
+        root = photo_id
+        while parent.get(root, root) != root:
+            root = parent[root]
+        while parent.get(photo_id, photo_id) != root:
+            parent[photo_id], photo_id = root, parent[photo_id]
+        return root
+
+    for photo_id, value in index.hashes.items():
+        for _, other_id in index.search(value, threshold):
+            if other_id > photo_id:
+                root_a, root_b = find(photo_id), find(other_id)
+                if root_a != root_b:
+                    parent[max(root_a, root_b)] = min(root_a, root_b)
+
+    clusters = {}
+    for photo_id in parent:
+        clusters.setdefault(find(photo_id), []).append(photo_id)
+    for root in clusters:
+        clusters[root].append(root)
+
+    return [db.get_photos_by_ids(sorted(set(photo_ids))) for photo_ids in clusters.values()]
+
+
+def format_near_duplicate_report(groups):
+    if not groups:
+        return "유사한 사진이 없습니다."
+    lines = [f"유사 사진 그룹 {len(groups)}개"]
+    for index, photos in enumerate(groups, start=1):
+        lines.append(f"\n[{index}] {len(photos)}장")
+        for photo in photos:
+            lines.append(f"  - ({photo['category']}) {photo['path']}")
+    return '\n'.join(lines)
+
+
+if __name__ == '__main__':
+    from database import Database
+    from config import DATABASE_PATH
+
+    db = Database(sys.argv[1] if len(sys.argv) > 1 else DATABASE_PATH)
+    db.connect()
+    print(format_near_duplicate_report(find_near_duplicates(db)))
+    db.close()
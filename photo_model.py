@@ -0,0 +1,133 @@
+from collections import OrderedDict
+from PyQt5.QtCore import QAbstractListModel, QModelIndex, Qt
+from PyQt5.QtGui import QPixmap, QColor
+from config import PHOTO_PAGE_SIZE, GRID_THUMBNAIL_SIZE, GRID_THUMBNAIL_MEMORY_ITEMS
+
+PHOTO_ID_ROLE = Qt.UserRole + 1
+
+
+def page_cursor(row):
+    # 다음 페이지를 요청할 키셋 위치: id 순서 목록은 id, 정렬 키가 붙은 목록은 (정렬 키, id)
+    return (row[3], row[0]) if len(row) > 3 else row[0]
+
+
+class PhotoListModel(QAbstractListModel):
+    def __init__(self, parent=None, page_size=PHOTO_PAGE_SIZE):
+        super().__init__(parent)
+        self.page_size = page_size
+        # fetch_page(after, limit) -> [(id, path, name), ...] 또는 [(id, path, name, 정렬 키), ...]
+        # after는 마지막 행의 id, 정렬 키가 있으면 (정렬 키, id)이며 첫 페이지는 0
+        self.fetch_page = None
+        self.rows = []
+        self.exhausted = True
+        self.row_by_path = {}
+        self.thumbnail_loader = None
+        self.show_thumbnails = False
+        self.thumbnails = OrderedDict()  # path -> QPixmap, 최근에 그려진 순서
+        self.failed_paths = set()  # 썸네일을 만들 수 없었던 파일: 스크롤할 때마다 다시 디코딩하지 않도록 기억
+        self.placeholder = QPixmap(GRID_THUMBNAIL_SIZE, GRID_THUMBNAIL_SIZE)
+        self.placeholder.fill(QColor('#303030'))
+
+    def set_thumbnail_loader(self, thumbnail_loader):
+        self.thumbnail_loader = thumbnail_loader
+        thumbnail_loader.thumbnail_loaded.connect(self.on_thumbnail_loaded)
+
+    def set_show_thumbnails(self, show_thumbnails):
+        self.beginResetModel()
+        self.show_thumbnails = show_thumbnails
+        if not show_thumbnails and self.thumbnail_loader:
+            self.thumbnail_loader.cancel_pending()
+        self.endResetModel()
+
+    def set_source(self, fetch_page):
+        self.beginResetModel()
+        self.fetch_page = fetch_page
+        self.rows = []
+        self.row_by_path = {}
+        if self.thumbnail_loader:
+            self.thumbnail_loader.cancel_pending()
+        self.exhausted = fetch_page is None
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.rows)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or index.row() >= len(self.rows):
+            return None
+        photo_id, path, name = self.rows[index.row()][:3]
+        if role == Qt.DisplayRole:
+            return name
+        if role == Qt.UserRole:
+            return path
+        if role == PHOTO_ID_ROLE:
+            return photo_id
+        if role == Qt.DecorationRole and self.show_thumbnails:
+            return self.thumbnail_for(path)
+        return None
+
+    def thumbnail_for(self, path):
+        # 뷰는 화면에 보이는 행에 대해서만 data()를 호출하므로 여기서 요청하면 스크롤에 맞춰 생성됨
+        pixmap = self.thumbnails.get(path)
+        if pixmap is not None:
+            self.thumbnails.move_to_end(path)
+            return pixmap
+        if path in self.failed_paths:
+            return self.placeholder
+        if self.thumbnail_loader:
+            self.thumbnail_loader.request(path)
+        return self.placeholder
+
+    def on_thumbnail_loaded(self, path, image):
+        if image.isNull():
+            self.failed_paths.add(path)
+            return
+        self.thumbnails[path] = QPixmap.fromImage(image)
+        while len(self.thumbnails) > GRID_THUMBNAIL_MEMORY_ITEMS:
+            self.thumbnails.popitem(last=False)
+        row = self.row_by_path.get(path)
+        if row is not None and self.show_thumbnails:
+            index = self.index(row)
+            self.dataChanged.emit(index, index, [Qt.DecorationRole])
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and not self.exhausted
+
+    def fetchMore(self, parent=QModelIndex()):
+        # 뷰가 스크롤 끝에 도달했을 때만 다음 페이지를 키셋 방식으로 조회
+        if parent.isValid() or self.exhausted:
+            return
+        page = self.fetch_page(self.last_cursor(), self.page_size)
+        if len(page) < self.page_size:
+            self.exhausted = True
+        if page:
+            self.beginInsertRows(QModelIndex(), len(self.rows), len(self.rows) + len(page) - 1)
+            for offset, row in enumerate(page, start=len(self.rows)):
+                self.row_by_path[row[1]] = offset
+            self.rows.extend(page)
+            self.endInsertRows()
+
+    def last_cursor(self):
+        return page_cursor(self.rows[-1]) if self.rows else 0
+
+    def photo_at(self, row):
+        photo_id, path, name = self.rows[row][:3]
+        return {'id': photo_id, 'path': path, 'name': name}
+
+    def all_paths(self):
+        return [path for path, _ in self.all_photos()]
+
+    def all_photos(self):
+        # 슬라이드쇼/내보내기 등 전체 목록이 필요할 때는 모델에 행을 추가하지 않고 남은 페이지를 직접 조회
+        # 반환값: [(경로, 이름), ...]
+        photos = [(row[1], row[2]) for row in self.rows]
+        after = self.last_cursor()
+        while not self.exhausted and self.fetch_page:
+            page = self.fetch_page(after, self.page_size)
+            photos.extend((row[1], row[2]) for row in page)
+            if len(page) < self.page_size:
+                break
+            after = page_cursor(page[-1])
+        return photos
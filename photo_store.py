@@ -0,0 +1,126 @@
+import os
+import sys
+import errno
+import stat
+import shutil
+from dedupe import hash_file
+from exporter import copy_file
+from config import STORE_USE_HARDLINKS, DUPLICATE_POLICY
+
+# 내용 주소 방식 사진 저장소: <store_dir>/<해시 앞 2자리>/<content_hash><확장자>
+# 같은 내용은 한 번만 저장되고, 이름이 같아도 내용이 다르면 다른 파일이 되므로 덮어쓰지 않음
+# 원래 파일 이름은 photos.name에만 있으며 내보내기/다운로드에서 그 이름을 사용함
+# 폴더는 해시 앞 2자리별로 최대 256개이므로 재스캔에서 사진 수만큼 폴더를 읽지 않음
+# 카테고리는 데이터베이스에만 있으므로 카테고리를 옮겨도 파일은 그대로 있음
+
+FICLONE = 0x40049409  # 리눅스 ioctl: btrfs/xfs 등에서 데이터 블록을 공유하는 복사(reflink)
+_LINK_FALLBACK_ERRNOS = {errno.EXDEV, errno.EPERM, errno.EACCES, errno.EMLINK, errno.ENOTSUP,
+                         errno.EOPNOTSUPP, errno.EINVAL, errno.ENOTTY, errno.EBADF, errno.ENOSYS}
+
+
+def reflink(source_path, destination_path):
+    # 성공하면 True, 지원하지 않는 파일 시스템/플랫폼이면 False
+    try:
+        import fcntl
+    except ImportError:
+        return False
+    try:
+        with open(source_path, 'rb') as source, open(destination_path, 'wb') as destination:
+            fcntl.ioctl(destination.fileno(), FICLONE, source.fileno())
+        shutil.copystat(source_path, destination_path)
+        return True
+    except OSError as e:
+        if e.errno not in _LINK_FALLBACK_ERRNOS:
+            raise
+        try:
+            os.remove(destination_path)
+        except OSError:
+            pass
+        return False
+
+
+def store_duplicate_policy(policy=DUPLICATE_POLICY):
+    # 같은 내용은 저장소 파일 하나가 되고 photos.path는 UNIQUE이므로 중복을 'link'로 추가해도 행이 생기지 않음
+    # (한 파일을 두 카테고리에 둘 수 없음) -> 저장소로 가져올 때는 중복을 건너뛰고 그 사실을 알림
+    if policy == 'link':
+        print("저장소로 가져올 때는 중복 사진을 연결하지 않고 건너뜁니다. (DUPLICATE_POLICY = 'link')")
+    return 'skip'
+
+
+class PhotoStore:
+    def __init__(self, store_dir, use_hardlinks=STORE_USE_HARDLINKS):
+        self.store_dir = store_dir
+        self.use_hardlinks = use_hardlinks
+
+    def path_for(self, content_hash, extension):
+        return os.path.join(self.store_dir, content_hash[:2], content_hash + extension.lower())
+
+    def find(self, content_hash, extension):
+        # 이미 저장된 같은 내용의 파일 경로, 없으면 None
+        path = self.path_for(content_hash, extension)
+        return path if os.path.isfile(path) else None
+
+    def ingest(self, source_path, content_hash=None):
+        # 저장소에 넣고 (저장된 경로, content_hash)를 돌려줌
+        # 같은 파일 시스템이면 reflink(설정에 따라 하드 링크)로 디스크를 쓰지 않고 넣고, 안 되면 스트리밍 복사
+        if content_hash is None:
+            content_hash = hash_file(source_path)
+            if content_hash is None:
+                return None, None
+        extension = os.path.splitext(source_path)[1]
+        existing = self.find(content_hash, extension)
+        if existing:
+            return existing, content_hash
+
+        destination_path = self.path_for(content_hash, extension)
+        os.makedirs(os.path.dirname(destination_path), exist_ok=True)
+        temp_path = f"{destination_path}.{os.getpid()}.tmp"
+        try:
+            if not reflink(source_path, temp_path) and not self._hardlink(source_path, temp_path):
+                copy_file(source_path, temp_path)
+            os.replace(temp_path, destination_path)
+        except OSError:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            raise
+        return destination_path, content_hash
+
+    def _hardlink(self, source_path, destination_path):
+        # 하드 링크는 원본과 같은 파일(inode)이므로 원본을 고치면 저장소 파일도 바뀌어 content_hash와 달라짐
+        # -> 쓰기 권한을 없애 원본을 그 자리에서 고칠 수 없게 함 (원본도 읽기 전용이 됨, STORE_USE_HARDLINKS로 켬)
+        if not self.use_hardlinks:
+            return False
+        try:
+            os.link(source_path, destination_path)
+            mode = os.stat(destination_path).st_mode
+            os.chmod(destination_path, mode & ~(stat.S_IWUSR | stat.S_IWGRP | stat.S_IWOTH))
+            return True
+        except OSError as e:
+            if e.errno not in _LINK_FALLBACK_ERRNOS:
+                raise
+            return False
+
+    def ingest_all(self, photos, stats=None):
+        # iter_new_photos의 (경로, 해시)를 받아 (저장소 경로, 해시, 원래 파일 이름)으로 바꿔 넘김 (가져오기 파이프라인에 끼워 사용)
+        for photo_path, content_hash in photos:
+            try:
+                stored_path, content_hash = self.ingest(photo_path, content_hash)
+            except OSError as e:
+                print(f"사진 저장 중 오류 발생: {e}")
+                continue
+            if stored_path is None:
+                continue
+            if stats is not None:
+                stats['stored'] = stats.get('stored', 0) + 1
+            yield (stored_path, content_hash, os.path.basename(photo_path))
+
+
+if __name__ == '__main__':
+    # 예) python photo_store.py D:/camera/IMG_0001.jpg
+    from config import APPLICATION_PATH, STORE_DIR_NAME
+
+    store = PhotoStore(os.path.join(APPLICATION_PATH, STORE_DIR_NAME))
+    for path in sys.argv[1:]:
+        print(store.ingest(path))
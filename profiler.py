@@ -0,0 +1,208 @@
+import io
+import sys
+import json
+import time
+import bisect
+import inspect
+import threading
+import functools
+from config import PROFILING_ENABLED
+
+# 지연 시간 계측: 이름별로 시간을 모아 히스토그램으로 집계하고, 필요하면 cProfile로 한 동작을 자세히 분석
+# 예) with profiler.timed('gui.update_preview'): ...
+#     @profiler.timed('file.load_photo')
+
+BUCKET_BOUNDS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+class LatencyHistogram:
+    def __init__(self):
+        self.counts = [0] * (len(BUCKET_BOUNDS_MS) + 1)  # 마지막 칸은 5초 초과
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def add(self, elapsed_ms):
+        self.counts[bisect.bisect_left(BUCKET_BOUNDS_MS, elapsed_ms)] += 1
+        self.count += 1
+        self.total_ms += elapsed_ms
+        if elapsed_ms > self.max_ms:
+            self.max_ms = elapsed_ms
+
+    def percentile(self, fraction):
+        # 버킷 상한으로 근사한 백분위 값
+        if not self.count:
+            return 0.0
+        target = self.count * fraction
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= target:
+                return min(BUCKET_BOUNDS_MS[index], round(self.max_ms, 3)) if index < len(BUCKET_BOUNDS_MS) else round(self.max_ms, 3)
+        return self.max_ms
+
+    def to_dict(self):
+        return {
+            'count': self.count,
+            'mean_ms': round(self.total_ms / self.count, 3) if self.count else 0.0,
+            'p50_ms': self.percentile(0.5),
+            'p95_ms': self.percentile(0.95),
+            'p99_ms': self.percentile(0.99),
+            'max_ms': round(self.max_ms, 3),
+            'buckets': {f"<={bound}": count for bound, count in zip(BUCKET_BOUNDS_MS, self.counts) if count},
+            'over': self.counts[-1],
+        }
+
+
+_enabled = PROFILING_ENABLED
+_histograms = {}
+_lock = threading.Lock()
+_profile = None
+
+
+def set_enabled(enabled):
+    global _enabled
+    _enabled = enabled
+
+
+def is_enabled():
+    return _enabled
+
+
+def record(name, elapsed_seconds):
+    if not _enabled:
+        return
+    with _lock:
+        histogram = _histograms.get(name)
+        if histogram is None:
+            histogram = _histograms[name] = LatencyHistogram()
+        histogram.add(elapsed_seconds * 1000)
+
+
+class timed:
+    # with 문과 데코레이터 양쪽으로 사용, 제너레이터 함수는 값을 꺼내는 데 걸린 시간의 합을 기록
+    def __init__(self, name):
+        self.name = name
+        self._local = threading.local()
+
+    def __enter__(self):
+        starts = self._local.__dict__.setdefault('starts', [])
+        starts.append(time.perf_counter())
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        record(self.name, time.perf_counter() - self._local.starts.pop())
+        return False
+
+    def __call__(self, function):
+        name = self.name
+        if inspect.isgeneratorfunction(function):
+            @functools.wraps(function)
+            def generator_wrapper(*args, **kwargs):
+                elapsed = 0.0
+                started = time.perf_counter()
+                iterator = function(*args, **kwargs)
+                try:
+                    while True:
+                        try:
+                            value = next(iterator)
+                        except StopIteration:
+                            break
+                        elapsed += time.perf_counter() - started
+                        yield value
+                        started = time.perf_counter()
+                    elapsed += time.perf_counter() - started
+                finally:
+                    iterator.close()
+                    record(name, elapsed)
+            return generator_wrapper
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                record(name, time.perf_counter() - started)
+        return wrapper
+
+
+def instrument(cls, prefix, exclude=()):
+    # 클래스의 공개 메서드를 모두 timed로 감쌈 (Database의 모든 쿼리 계측에 사용)
+    for attribute, value in list(vars(cls).items()):
+        if attribute.startswith('_') or attribute in exclude or not inspect.isfunction(value):
+            continue
+        setattr(cls, attribute, timed(f"{prefix}.{attribute}")(value))
+    return cls
+
+
+def snapshot():
+    with _lock:
+        return {name: histogram.to_dict() for name, histogram in sorted(_histograms.items())}
+
+
+def reset():
+    with _lock:
+        _histograms.clear()
+
+
+def format_report():
+    stats = snapshot()
+    if not stats:
+        return "수집된 측정값이 없습니다."
+    lines = [f"{'이름':40} {'횟수':>8} {'평균':>9} {'p50':>8} {'p95':>8} {'p99':>8} {'최대':>9}  (ms)"]
+    for name, values in sorted(stats.items(), key=lambda item: -item[1]['mean_ms'] * item[1]['count']):
+        lines.append(f"{name:40} {values['count']:>8} {values['mean_ms']:>9.2f} {values['p50_ms']:>8} "
+                     f"{values['p95_ms']:>8} {values['p99_ms']:>8} {values['max_ms']:>9.2f}")
+    return '\n'.join(lines)
+
+
+def dump(path):
+    try:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'), 'histograms': snapshot()},
+                      f, ensure_ascii=False, indent=2)
+        return True
+    except (PermissionError, IOError) as e:
+        print(f"측정 결과 저장 중 오류 발생: {e}")
+        return False
+
+
+def start_profile():
+    # cProfile은 이 함수를 부른 스레드(GUI 스레드)만 분석함
+    global _profile
+    import cProfile
+
+    if _profile is not None:
+        return False
+    _profile = cProfile.Profile()
+    _profile.enable()
+    return True
+
+
+def stop_profile(path=None, limit=40):
+    # 분석을 멈추고 누적 시간 순 상위 limit개 함수의 보고서를 돌려줌 (path가 있으면 .prof 파일도 저장)
+    global _profile
+    import pstats
+
+    if _profile is None:
+        return None
+    profile, _profile = _profile, None
+    profile.disable()
+    if path:
+        profile.dump_stats(path)
+    output = io.StringIO()
+    pstats.Stats(profile, stream=output).sort_stats('cumulative').print_stats(limit)
+    return output.getvalue()
+
+
+def is_profiling():
+    return _profile is not None
+
+
+if __name__ == '__main__':
+    # 저장한 측정 결과(JSON)를 표로 출력
+    with open(sys.argv[1], encoding='utf-8') as f:
+        data = json.load(f)
+    for name, values in data['histograms'].items():
+        print(f"{name:40} {values['count']:>8} {values['mean_ms']:>9.2f} {values['p95_ms']:>8} {values['max_ms']:>9.2f}")
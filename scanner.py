@@ -0,0 +1,117 @@
+import os
+import sys
+from collections import Counter, defaultdict
+from config import RESOURCES_DIR, PHOTO_EXTENSIONS, STORE_DIR_NAME
+
+
+class ScanResult:
+    def __init__(self):
+        self.added = 0
+        self.changed = 0
+        self.missing = 0
+        self.category_ids = set()  # 변경이 있었던 카테고리
+
+    def __bool__(self):
+        return bool(self.added or self.changed or self.missing)
+
+    def __str__(self):
+        return f"추가 {self.added}장, 변경 {self.changed}장, 없어진 파일 {self.missing}장"
+
+
+class LibraryScanner:
+    def __init__(self, db, resources_dir=RESOURCES_DIR, store_dir=None):
+        self.db = db
+        self.resources_dir = resources_dir
+        # 저장소는 데이터베이스 옆에 있으며 가져오기로만 채워짐
+        self.store_dir = os.path.normpath(store_dir or os.path.join(os.path.dirname(os.path.abspath(db.db_path)),
+                                                                   STORE_DIR_NAME))
+
+    def scan(self, directories=None, should_stop=None):
+        # 저장된 크기/수정 시각과 os.scandir의 stat 정보를 비교하여 바뀐 파일만 반영
+        # directories를 주면 해당 폴더만 검사 (파일 감시에서 사용)
+        if directories is not None:
+            directories = {os.path.normpath(directory) for directory in directories}
+        # 일부 폴더만 검사할 때는 그 폴더의 행만 읽으므로 라이브러리 크기와 무관하게 빠름
+        known = defaultdict(dict)  # 폴더 -> {파일 이름: (id, category_id, file_size, mtime_ns)}
+        for photo_id, path, category_id, file_size, mtime_ns in self.db.iter_photo_index(directories):
+            directory, name = os.path.split(path)
+            known[os.path.normpath(directory)][name] = (photo_id, category_id, file_size, mtime_ns)
+
+        category_ids = self.db.get_category_ids()
+        category_dirs = {os.path.normpath(os.path.join(self.resources_dir, name)): category_id
+                         for name, category_id in category_ids.items()}
+
+        if directories is None:
+            directories = set(known) | set(category_dirs)
+
+        result = ScanResult()
+        added_rows, changed_rows, missing_ids = [], [], []
+        for directory in directories:
+            if should_stop and should_stop():
+                break
+            known_files = known.get(directory, {})
+            category_id = category_dirs.get(directory) or self._directory_category(known_files)
+            if directory == self.store_dir or directory.startswith(self.store_dir + os.sep):
+                # 저장소 파일은 이름이 해시라 원래 이름을 알 수 없고, 등록되지 않은 파일은 삭제한 사진의 남은 파일이므로 추가하지 않음
+                # (변경/누락 검사는 그대로 함)
+                category_id = None
+            seen = set()
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if not entry.name.lower().endswith(PHOTO_EXTENSIONS) or not entry.is_file():
+                            continue
+                        seen.add(entry.name)
+                        stat_result = entry.stat()
+                        row = known_files.get(entry.name)
+                        if row is None:
+                            if category_id is not None:
+                                added_rows.append((entry.path, entry.name, category_id,
+                                                   stat_result.st_size, stat_result.st_mtime_ns))
+                                result.category_ids.add(category_id)
+                        elif (row[2], row[3]) != (stat_result.st_size, stat_result.st_mtime_ns):
+                            changed_rows.append((stat_result.st_size, stat_result.st_mtime_ns, row[0]))
+                            result.category_ids.add(row[1])
+            except (FileNotFoundError, NotADirectoryError) as e:
+                # 폴더 자체가 없으면 연결이 끊긴 외장 디스크/네트워크 공유일 수 있으므로 사진을 지우지 않고 건너뜀
+                # 누락 처리는 실제로 목록을 읽은 폴더에서 빠진 파일에만 적용됨
+                if known_files:
+                    print(f"폴더를 찾을 수 없습니다: {e}")
+                continue
+            except PermissionError as e:
+                # 읽을 수 없는 폴더의 사진은 삭제로 취급하지 않음
+                print(f"폴더를 읽을 수 없습니다: {e}")
+                continue
+
+            for name, row in known_files.items():
+                if name not in seen:
+                    missing_ids.append(row[0])
+                    result.category_ids.add(row[1])
+
+        if added_rows or changed_rows or missing_ids:
+            if not self.db.apply_scan_changes(added_rows, changed_rows, missing_ids):
+                return ScanResult()
+        result.added, result.changed, result.missing = len(added_rows), len(changed_rows), len(missing_ids)
+        return result
+
+    @staticmethod
+    def _directory_category(known_files):
+        # 카테고리 폴더가 아닌 곳에 새로 생긴 파일은 같은 폴더의 기존 사진이 가장 많이 속한 카테고리로 추가
+        counts = Counter(row[1] for row in known_files.values() if row[1] is not None)
+        if counts:
+            return counts.most_common(1)[0][0]
+        return None
+
+
+if __name__ == '__main__':
+    from database import Database
+    from config import DATABASE_PATH
+    from metadata import extract_missing_metadata
+
+    db = Database(sys.argv[1] if len(sys.argv) > 1 else DATABASE_PATH)
+    db.connect()
+    result = LibraryScanner(db).scan()
+    print(result)
+    if result:
+        extract_missing_metadata(db)
+    db.close()
@@ -1,6 +1,45 @@
-from PyQt5.QtWidgets import QWidget, QLabel, QVBoxLayout
-from PyQt5.QtGui import QPixmap, QPalette, QColor
-from PyQt5.QtCore import Qt, QTimer, pyqtSignal, QSize
+from PyQt5.QtWidgets import QWidget, QLabel, QVBoxLayout, QDesktopWidget
+from PyQt5.QtGui import QPixmap, QPalette, QColor, QImage
+from PyQt5.QtCore import Qt, QTimer, pyqtSignal, QSize, QObject, QRunnable, QThreadPool
+from file_handler import FileHandler
+from image_cache import shared_cache
+from config import SLIDESHOW_PREFETCH_AHEAD, SLIDESHOW_PREFETCH_BEHIND, SLIDESHOW_DECODE_THREADS, PROGRESSIVE_PREVIEW
+
+
+class _SlideSignals(QObject):
+    loaded = pyqtSignal(int, str, QImage)
+    preview = pyqtSignal(int, str, QImage)  # 지금 보여줄 사진의 저해상도 첫 화면
+
+
+class _SlideTask(QRunnable):
+    def __init__(self, signals, index, file_path, target_size, quick=False, image_cache=shared_cache):
+        super().__init__()
+        self.image_cache = image_cache
+        self.signals = signals
+        self.index = index
+        self.file_path = file_path
+        self.target_size = target_size
+        self.quick = quick
+
+    def run(self):
+        if self.quick:
+            # 미리 읽기로 준비되지 않은 사진은 저해상도 이미지를 먼저 보여줌
+            image, original_size = FileHandler.load_quick_preview(
+                self.file_path, self.target_size.width(), self.target_size.height())
+            if image is not None:
+                # 최종 이미지와 같은 크기로 늘려 창 크기가 바뀌지 않도록 함
+                display_size = QSize(*original_size)
+                if display_size.width() > self.target_size.width() or display_size.height() > self.target_size.height():
+                    display_size = display_size.scaled(self.target_size, Qt.KeepAspectRatio)
+                image = image.scaled(display_size, Qt.IgnoreAspectRatio, Qt.FastTransformation)
+                self.signals.preview.emit(self.index, self.file_path, image)
+        # 화면 크기로 축소 디코딩하여 원본 해상도와 무관하게 메모리 사용량을 제한
+        image, original_size = FileHandler.load_scaled_photo(
+            self.file_path, self.target_size.width(), self.target_size.height())
+        self.image_cache.put(self.file_path, self.target_size.width(), self.target_size.height(),
+                             image, original_size)
+        self.signals.loaded.emit(self.index, self.file_path, image if image is not None else QImage())
+
 
 class SlideShow(QWidget):
     closed = pyqtSignal()
@@ -10,6 +49,14 @@ class SlideShow(QWidget):
         self.photo_paths = photo_paths
         self.current_index = 0
         self.image_label = QLabel(self)
+        self.buffer = {}  # index -> 화면 크기로 디코딩된 QImage
+        self.image_cache = shared_cache
+        self.pending = set()
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(SLIDESHOW_DECODE_THREADS)
+        self.signals = _SlideSignals()
+        self.signals.loaded.connect(self.on_image_loaded)
+        self.signals.preview.connect(self.on_preview_loaded)
         self.initUI()
 
     def initUI(self):
@@ -27,6 +74,8 @@ class SlideShow(QWidget):
         layout.addWidget(self.image_label)
         self.setLayout(layout)
 
+        self.target_size = QDesktopWidget().availableGeometry(self).size()
+
         self.timer = QTimer(self)
         self.timer.timeout.connect(self.next_image)
         self.timer.start(3000)  # 3초 간격
@@ -35,28 +84,97 @@ class SlideShow(QWidget):
 
     def show_image(self):
         if 0 <= self.current_index < len(self.photo_paths):
-            pixmap = QPixmap(self.photo_paths[self.current_index])
-            if not pixmap.isNull():
-                self.image_label.setPixmap(pixmap)
-                self.image_label.setAlignment(Qt.AlignCenter)
-                # 창 크기를 이미지 크기에 맞춤
-                self.resize(pixmap.size())
+            image = self.buffer.get(self.current_index)
+            if image is None:
+                # 아직 디코딩되지 않았다면 완료 시 on_image_loaded에서 표시
+                self.request_image(self.current_index, quick=PROGRESSIVE_PREVIEW)
             else:
-                self.image_label.setText("이미지를 불러올 수 없습니다.")
-                self.resize(400, 300)  # 기본 크기 설정
+                self.display(image)
+            self.prefetch()
+
+    def display(self, image):
+        if not image.isNull():
+            pixmap = QPixmap.fromImage(image)
+            self.image_label.setPixmap(pixmap)
+            self.image_label.setAlignment(Qt.AlignCenter)
+            # 창 크기를 이미지 크기에 맞춤 (이미지는 화면 크기 이하로 디코딩됨)
+            self.resize(pixmap.size())
+        else:
+            self.image_label.setText("이미지를 불러올 수 없습니다.")
+            self.resize(400, 300)  # 기본 크기 설정
+
+    def window_indices(self):
+        count = len(self.photo_paths)
+        indices = [self.current_index]
+        for offset in range(1, SLIDESHOW_PREFETCH_AHEAD + 1):
+            indices.append((self.current_index + offset) % count)
+        for offset in range(1, SLIDESHOW_PREFETCH_BEHIND + 1):
+            indices.append((self.current_index - offset) % count)
+        return indices
+
+    def prefetch(self):
+        wanted = self.window_indices()
+        # 창 밖으로 벗어난 이미지는 버퍼에서 제거하여 메모리를 일정하게 유지
+        for index in list(self.buffer):
+            if index not in wanted:
+                del self.buffer[index]
+        for index in wanted:
+            self.request_image(index)
+
+    def request_image(self, index, quick=False):
+        if index in self.buffer or index in self.pending:
+            return
+        # 미리보기 창과 함께 쓰는 캐시에 있으면 디코딩하지 않음 (앞뒤로 넘겨 보는 경우)
+        cached = self.image_cache.get(self.photo_paths[index], self.target_size.width(), self.target_size.height())
+        if cached:
+            self.buffer[index] = cached[0]
+            if index == self.current_index:
+                self.display(cached[0])
+            return
+        self.pending.add(index)
+        task = _SlideTask(self.signals, index, self.photo_paths[index], self.target_size, quick, self.image_cache)
+        # 지금 보여줄 사진은 미리 읽기 작업보다 먼저 디코딩
+        self.pool.start(task, 1 if index == self.current_index else 0)
+
+    def on_preview_loaded(self, index, file_path, image):
+        if index != self.current_index or index in self.buffer or self.photo_paths[index] != file_path:
+            return
+        self.display(image)
+
+    def on_image_loaded(self, index, file_path, image):
+        self.pending.discard(index)
+        if index >= len(self.photo_paths) or self.photo_paths[index] != file_path:
+            return
+        if index not in self.window_indices():
+            return
+        self.buffer[index] = image
+        if index == self.current_index:
+            self.display(image)
 
     def next_image(self):
         self.current_index = (self.current_index + 1) % len(self.photo_paths)
         self.show_image()
 
+    def previous_image(self):
+        self.current_index = (self.current_index - 1) % len(self.photo_paths)
+        self.show_image()
+
     def keyPressEvent(self, event):
         if event.key() == Qt.Key_Escape:
             self.close()
+        elif event.key() == Qt.Key_Right:
+            self.next_image()
+            self.timer.start()
+        elif event.key() == Qt.Key_Left:
+            self.previous_image()
+            self.timer.start()
         else:
             super().keyPressEvent(event)
 
     def closeEvent(self, event):
         self.timer.stop()
+        self.pool.clear()
+        self.pool.waitForDone()
+        self.buffer.clear()
         self.closed.emit()
         super().closeEvent(event)
-
@@ -0,0 +1,160 @@
+import os
+import hashlib
+import threading
+from collections import OrderedDict
+from config import THUMBNAIL_SIZES, THUMBNAIL_CACHE_MAX_BYTES, THUMBNAIL_QUALITY
+
+
+class ThumbnailCache:
+    def __init__(self, cache_dir, max_bytes=THUMBNAIL_CACHE_MAX_BYTES, sizes=THUMBNAIL_SIZES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.sizes = tuple(sorted(sizes))
+        self.total_bytes = 0
+        self._entries = OrderedDict()  # key -> (파일 경로, 크기), 오래된 항목이 앞쪽
+        self._lock = threading.Lock()
+        self._loaded = False
+
+    def bucket_for(self, width, height):
+        # 요청 크기를 담을 수 있는 가장 작은 버킷, 없으면 원본을 사용해야 함
+        longest = max(width, height)
+        for size in self.sizes:
+            if size >= longest:
+                return size
+        return None
+
+    @staticmethod
+    def cache_key(file_path, stat_result, bucket):
+        raw = f"{os.path.abspath(file_path)}|{stat_result.st_mtime_ns}|{stat_result.st_size}|{bucket}"
+        return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def original_size_from_path(thumbnail_path):
+        # 파일 이름 형식: <key>_<원본 너비>x<원본 높이>.jpg
+        try:
+            size_part = os.path.splitext(os.path.basename(thumbnail_path))[0].rsplit('_', 1)[1]
+            width, height = size_part.split('x')
+            return int(width), int(height)
+        except (IndexError, ValueError):
+            return None
+
+    def get_thumbnail_path(self, file_path, bucket):
+        try:
+            stat_result = os.stat(file_path)
+        except OSError as e:
+            print(f"썸네일 원본을 확인할 수 없습니다: {e}")
+            return None
+
+        key = self.cache_key(file_path, stat_result, bucket)
+        with self._lock:
+            self._load_index()
+            entry = self._entries.get(key)
+            if entry:
+                self._entries.move_to_end(key)
+        if entry:
+            if os.path.exists(entry[0]):
+                self._touch(entry[0])
+                return entry[0]
+            self._forget(key)
+
+        return self._generate(file_path, key, bucket)
+
+    def has_thumbnail(self, file_path, width, height):
+        # 만들지 않고 캐시에 이미 있는지만 확인 (미리보기 빠른 첫 화면 단계를 건너뛸지 판단)
+        bucket = self.bucket_for(width, height)
+        if not bucket:
+            return False
+        try:
+            key = self.cache_key(file_path, os.stat(file_path), bucket)
+        except OSError:
+            return False
+        with self._lock:
+            self._load_index()
+            entry = self._entries.get(key)
+        return bool(entry) and os.path.exists(entry[0])
+
+    def _generate(self, file_path, key, bucket):
+        from PIL import Image, UnidentifiedImageError
+
+        try:
+            with Image.open(file_path) as image:
+                original_size = image.size
+                # JPEG은 DCT 단계에서 축소 디코딩하여 전체 해상도 디코딩을 피함
+                image.draft('RGB', (bucket, bucket))
+                image.thumbnail((bucket, bucket), Image.LANCZOS)
+                if image.mode != 'RGB':
+                    image = image.convert('RGB')
+
+                thumbnail_path = self._thumbnail_file(key, original_size)
+                os.makedirs(os.path.dirname(thumbnail_path), exist_ok=True)
+                temp_path = f"{thumbnail_path}.{threading.get_ident()}.tmp"
+                image.save(temp_path, 'JPEG', quality=THUMBNAIL_QUALITY)
+                os.replace(temp_path, thumbnail_path)
+        except (FileNotFoundError, PermissionError, IOError, UnidentifiedImageError) as e:
+            print(f"썸네일 생성 중 오류 발생: {e}")
+            return None
+
+        size = os.path.getsize(thumbnail_path)
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous:
+                self.total_bytes -= previous[1]
+            self._entries[key] = (thumbnail_path, size)
+            self.total_bytes += size
+            self._evict()
+        return thumbnail_path
+
+    def _thumbnail_file(self, key, original_size):
+        file_name = f"{key}_{original_size[0]}x{original_size[1]}.jpg"
+        return os.path.join(self.cache_dir, key[:2], file_name)
+
+    def _load_index(self):
+        # 최초 접근 시 디스크의 캐시를 마지막 사용 시각(mtime) 순으로 읽어 LRU 순서를 복원
+        if self._loaded:
+            return
+        self._loaded = True
+        found = []
+        if os.path.isdir(self.cache_dir):
+            for shard in os.scandir(self.cache_dir):
+                if not shard.is_dir():
+                    continue
+                for entry in os.scandir(shard.path):
+                    if not entry.name.endswith('.jpg'):
+                        continue
+                    stat_result = entry.stat()
+                    key = entry.name.split('_', 1)[0]
+                    found.append((stat_result.st_mtime, key, entry.path, stat_result.st_size))
+        found.sort()
+        for _, key, path, size in found:
+            self._entries[key] = (path, size)
+            self.total_bytes += size
+        self._evict()
+
+    def _evict(self):
+        while self.total_bytes > self.max_bytes and self._entries:
+            _, (path, size) = self._entries.popitem(last=False)
+            self.total_bytes -= size
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def _forget(self, key):
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry:
+                self.total_bytes -= entry[1]
+
+    @staticmethod
+    def _touch(path):
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+    def clear(self):
+        with self._lock:
+            self._load_index()
+            self.max_bytes, max_bytes = 0, self.max_bytes
+            self._evict()
+            self.max_bytes = max_bytes
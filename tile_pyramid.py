@@ -0,0 +1,242 @@
+import os
+import io
+import sys
+import json
+import mmap
+import shutil
+import hashlib
+from array import array
+from config import TILE_SIZE, TILE_QUALITY, TILE_MAX_IMAGE_PIXELS, TILE_CACHE_MAX_PYRAMIDS
+
+# 아주 큰 사진(파노라마, 스캔)을 위한 다중 해상도 타일 피라미드
+# 한 번 만들어 두면 보기 화면은 mmap으로 필요한 타일만 읽으므로 원본 크기와 무관하게 메모리가 일정함
+#
+# <cache_dir>/<key>/pyramid.json  원본 크기, 단계별 크기와 타일 수
+# <cache_dir>/<key>/tiles.bin     JPEG 타일을 단계 순서대로 이어 붙인 파일
+# <cache_dir>/<key>/index.bin     타일마다 (시작 위치, 길이) uint64 두 개
+
+PYRAMID_VERSION = 1
+
+
+def pyramid_key(file_path):
+    stat_result = os.stat(file_path)
+    raw = f"{os.path.abspath(file_path)}|{stat_result.st_mtime_ns}|{stat_result.st_size}|{TILE_SIZE}|{PYRAMID_VERSION}"
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+
+def pyramid_dir(cache_dir, file_path):
+    return os.path.join(cache_dir, pyramid_key(file_path))
+
+
+class _BandReader:
+    # 원본을 가로 띠 단위로 RGB로 읽음
+    # 스트립/타일 단위로 저장된 무압축 TIFF 등은 띠와 겹치는 조각만 디코딩하고,
+    # 조각이 하나뿐인 형식은 한 번만 불러와(무압축이면 mmap) 띠를 잘라 씀
+    def __init__(self, file_path, source):
+        self.file_path = file_path
+        self.width, self.height = source.size
+        self.source = None
+        self.parts = list(source.tile) if len(source.tile) > 1 else None
+        if self.parts is None:
+            # JPEG/PNG처럼 한 덩어리로 압축된 형식은 부분 디코딩이 안 되므로 원본 크기로 한 번 디코딩함
+            source.load()
+            self.source = source
+
+    def read(self, top, bottom):
+        if self.source is None:
+            try:
+                band = self._read_parts(top, bottom)
+                return band if band.mode == 'RGB' else band.convert('RGB')
+            except (OSError, ValueError, AttributeError, TypeError) as e:
+                # Pillow 내부 구조가 달라 바꾼 조각 목록을 디코더가 거부하면 원본을 한 번 불러와 잘라 씀
+                print(f"부분 디코딩을 사용할 수 없어 전체를 불러옵니다: {e}")
+                self._load_whole()
+        band = self.source.crop((0, top, self.width, bottom))
+        return band if band.mode == 'RGB' else band.convert('RGB')
+
+    def _load_whole(self):
+        from PIL import Image
+
+        self.parts = None
+        self.source = Image.open(self.file_path)
+        self.source.load()
+
+    def _read_parts(self, top, bottom):
+        # Pillow 내부 속성(tile, _size)을 바꿔 일부만 디코딩함 (Pillow 12.3에서 확인, 실패하면 read가 전체 불러오기로 전환)
+        from PIL import Image
+
+        parts = [part for part in self.parts if part[1][1] < bottom and part[1][3] > top]
+        part_top = min(part[1][1] for part in parts)
+        part_bottom = max(part[1][3] for part in parts)
+        with Image.open(self.file_path) as image:
+            # 겹치는 조각만 남기고 좌표를 옮겨 띠 높이의 이미지로 디코딩
+            image.tile = [_shift_part(part, part_top) for part in parts]
+            image._size = (self.width, part_bottom - part_top)
+            image.load()
+            return image.crop((0, top - part_top, self.width, bottom - part_top))
+
+
+def _shift_part(part, top):
+    # 최신 Pillow의 타일 항목은 namedtuple(_Tile), 이전 버전은 일반 튜플
+    name, (x0, y0, x1, y1), offset, args = part
+    extents = (x0, y0 - top, x1, y1 - top)
+    return part._replace(extents=extents) if hasattr(part, '_replace') else (name, extents, offset, args)
+
+
+def _plan_levels(width, height):
+    levels = []
+    first_tile = 0
+    while True:
+        columns = (width + TILE_SIZE - 1) // TILE_SIZE
+        rows = (height + TILE_SIZE - 1) // TILE_SIZE
+        levels.append({'width': width, 'height': height, 'columns': columns, 'rows': rows,
+                       'first_tile': first_tile})
+        first_tile += columns * rows
+        if columns == 1 and rows == 1:
+            return levels
+        width, height = (width + 1) // 2, (height + 1) // 2  # reduce(2)와 같은 올림 크기
+
+
+def build_pyramid(file_path, cache_dir):
+    # 원본 전체를 한 장의 RGB 이미지로 만들지 않고 TILE_SIZE 높이의 가로 띠로 읽어 0단계 타일을 만들고,
+    # 띠를 절반으로 줄인(reduce) 조각 두 개를 모아 다음 단계의 띠를 만듦 (단계마다 띠 한두 개만 메모리에 있음)
+    # 프로세스 풀에서 실행하면 빌드가 끝난 뒤 디코딩에 쓴 메모리가 운영체제로 돌아감
+    from PIL import Image
+
+    target_dir = pyramid_dir(cache_dir, file_path)
+    if os.path.exists(os.path.join(target_dir, 'pyramid.json')):
+        return target_dir
+
+    temp_dir = f"{target_dir}.{os.getpid()}.tmp"
+    shutil.rmtree(temp_dir, ignore_errors=True)
+    os.makedirs(temp_dir)
+    Image.MAX_IMAGE_PIXELS = TILE_MAX_IMAGE_PIXELS  # 큰 스캔 파일이 압축 폭탄 검사에 걸리지 않도록
+    level_files = []
+    try:
+        with Image.open(file_path) as source:
+            levels = _plan_levels(*source.size)
+            reader = _BandReader(file_path, source)
+            # 단계마다 타일을 별도 파일에 쓰고 마지막에 단계 순서대로 이어 붙임
+            level_files = [open(os.path.join(temp_dir, f"level{level}.bin"), 'w+b') for level in range(len(levels))]
+            level_indexes = [array('Q') for _ in levels]
+            pending = [[] for _ in levels]  # 단계별로 위 단계에서 줄여 내려온, 아직 띠가 되지 못한 조각
+            next_top = [0] * len(levels)
+
+            def write_band(level, band):
+                info = levels[level]
+                top = next_top[level]
+                next_top[level] += band.height
+                tiles, index = level_files[level], level_indexes[level]
+                for column in range(info['columns']):
+                    box = (column * TILE_SIZE, 0, min(info['width'], (column + 1) * TILE_SIZE), band.height)
+                    output = io.BytesIO()
+                    band.crop(box).save(output, 'JPEG', quality=TILE_QUALITY)
+                    index.extend((tiles.tell(), output.tell()))
+                    tiles.write(output.getbuffer())
+                if level + 1 == len(levels):
+                    return
+                # 띠의 위쪽 경계가 짝수 행이므로 띠마다 줄여도 전체를 한 번에 줄인 결과와 같음
+                pending[level + 1].append(band.reduce(2))
+                filled = sum(part.height for part in pending[level + 1])
+                if filled >= TILE_SIZE or next_top[level] >= info['height']:
+                    parts, pending[level + 1] = pending[level + 1], []
+                    if len(parts) == 1:
+                        merged = parts[0]
+                    else:
+                        merged = Image.new('RGB', (levels[level + 1]['width'], filled))
+                        offset = 0
+                        for part in parts:
+                            merged.paste(part, (0, offset))
+                            offset += part.height
+                    write_band(level + 1, merged)
+
+            for top in range(0, levels[0]['height'], TILE_SIZE):
+                write_band(0, reader.read(top, min(levels[0]['height'], top + TILE_SIZE)))
+
+        index = array('Q')
+        with open(os.path.join(temp_dir, 'tiles.bin'), 'wb') as tiles:
+            for level_file, level_index in zip(level_files, level_indexes):
+                base = tiles.tell()
+                for position in range(0, len(level_index), 2):
+                    level_index[position] += base
+                index.extend(level_index)
+                level_file.seek(0)
+                shutil.copyfileobj(level_file, tiles)
+                level_file.close()
+                os.remove(level_file.name)
+        with open(os.path.join(temp_dir, 'index.bin'), 'wb') as f:
+            index.tofile(f)
+        with open(os.path.join(temp_dir, 'pyramid.json'), 'w', encoding='utf-8') as f:
+            json.dump({'version': PYRAMID_VERSION, 'source': os.path.abspath(file_path),
+                       'tile_size': TILE_SIZE, 'levels': levels}, f)
+        try:
+            os.replace(temp_dir, target_dir)
+        except OSError:
+            # 다른 프로세스가 먼저 만든 경우
+            shutil.rmtree(temp_dir, ignore_errors=True)
+    except Exception:
+        for level_file in level_files:
+            level_file.close()
+        shutil.rmtree(temp_dir, ignore_errors=True)
+        raise
+    prune_pyramids(cache_dir)
+    return target_dir
+
+
+def prune_pyramids(cache_dir, keep=TILE_CACHE_MAX_PYRAMIDS):
+    # 최근에 연 피라미드 keep개만 남김
+    try:
+        entries = [entry for entry in os.scandir(cache_dir) if entry.is_dir() and not entry.name.endswith('.tmp')]
+    except FileNotFoundError:
+        return
+    entries.sort(key=lambda entry: entry.stat().st_mtime, reverse=True)
+    for entry in entries[keep:]:
+        shutil.rmtree(entry.path, ignore_errors=True)
+
+
+class TilePyramid:
+    def __init__(self, directory):
+        self.directory = directory
+        with open(os.path.join(directory, 'pyramid.json'), encoding='utf-8') as f:
+            info = json.load(f)
+        self.tile_size = info['tile_size']
+        self.levels = info['levels']
+        self.width, self.height = self.levels[0]['width'], self.levels[0]['height']
+        self.index = array('Q')
+        with open(os.path.join(directory, 'index.bin'), 'rb') as f:
+            self.index.frombytes(f.read())
+        self._file = open(os.path.join(directory, 'tiles.bin'), 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        os.utime(directory)  # prune_pyramids에서 최근 사용으로 취급
+
+    def level_for_scale(self, scale):
+        # 화면 1픽셀에 원본 몇 픽셀이 들어가는지에 맞춰 가장 작은 충분한 해상도의 단계를 고름
+        level = 0
+        while level + 1 < len(self.levels) and scale <= 0.5 ** (level + 1):
+            level += 1
+        return level
+
+    def tile_bytes(self, level, column, row):
+        # mmap 조각만 읽으므로 다른 타일은 페이지 캐시에만 남고 프로세스 메모리를 차지하지 않음
+        info = self.levels[level]
+        if not (0 <= column < info['columns'] and 0 <= row < info['rows']):
+            return None
+        tile = info['first_tile'] + row * info['columns'] + column
+        offset, length = self.index[tile * 2], self.index[tile * 2 + 1]
+        return self._map[offset:offset + length]
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._file.close()
+            self._map = None
+
+
+if __name__ == '__main__':
+    # 예) python tile_pyramid.py panorama.tif
+    from config import APPLICATION_PATH, TILE_DIR_NAME
+
+    directory = build_pyramid(sys.argv[1], os.path.join(APPLICATION_PATH, TILE_DIR_NAME))
+    pyramid = TilePyramid(directory)
+    print(f"{pyramid.width}x{pyramid.height}, 단계 {len(pyramid.levels)}개: {directory}")
+    pyramid.close()
@@ -0,0 +1,202 @@
+import math
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from PyQt5.QtWidgets import QWidget
+from PyQt5.QtGui import QPainter, QImage, QColor
+from PyQt5.QtCore import Qt, QObject, QRunnable, QThreadPool, QPointF, QRectF, pyqtSignal
+from tile_pyramid import TilePyramid, build_pyramid
+from config import TILE_VIEWER_MEMORY_TILES
+
+MAX_ZOOM = 4.0  # 원본 1픽셀을 화면 4픽셀까지 확대
+ZOOM_STEP = 1.25
+
+
+class _BuildTask(QRunnable):
+    def __init__(self, builder, file_path):
+        super().__init__()
+        self.builder = builder
+        self.file_path = file_path
+
+    def run(self):
+        # 원본은 별도 프로세스에서 띠 단위로 읽어 타일을 만들므로 보기 화면의 메모리는 늘지 않음
+        try:
+            with ProcessPoolExecutor(max_workers=1) as executor:
+                directory = executor.submit(build_pyramid, self.file_path, self.builder.cache_dir).result()
+            self.builder.built.emit(self.file_path, directory, '')
+        except Exception as e:
+            self.builder.built.emit(self.file_path, '', str(e))
+
+
+class PyramidBuilder(QObject):
+    # 피라미드 생성은 보기 창보다 오래 사는 이 객체의 스레드 풀에서 실행
+    # 보기 창을 닫거나 다른 사진으로 바꿔도 진행 중인 생성이 끝나기를 기다리지 않으며, 결과는 닫힌 창이 무시함
+    built = pyqtSignal(str, str, str)  # 원본 경로, 피라미드 폴더, 오류 메시지
+
+    def __init__(self, cache_dir, parent=None):
+        super().__init__(parent)
+        self.cache_dir = cache_dir
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(1)
+
+    def request(self, file_path):
+        # 아직 시작하지 않은 이전 요청은 더 이상 볼 창이 없으므로 버림
+        self.pool.clear()
+        self.pool.start(_BuildTask(self, file_path))
+
+    def shutdown(self):
+        self.pool.clear()
+
+
+class TileViewer(QWidget):
+    # 전체 화면 확대/이동 보기: 현재 배율에 맞는 단계에서 화면에 보이는 타일만 읽어 그림
+    # 마우스 휠: 확대/축소, 끌기: 이동, 0 또는 더블클릭: 화면에 맞춤, Esc: 닫기
+    def __init__(self, file_path, builder):
+        super().__init__()
+        self.file_path = file_path
+        self.pyramid = None
+        self.message = '큰 사진을 준비하는 중...'
+        self.scale = 1.0  # 원본 1픽셀당 화면 픽셀 수
+        self.origin = QPointF(0, 0)  # 화면 왼쪽 위에 놓인 원본 좌표
+        self.fitted = True
+        self.drag_position = None
+        self.tiles = OrderedDict()  # (단계, 열, 행) -> QImage, 오래된 항목이 앞쪽
+        self.closed = False
+
+        self.setWindowTitle(file_path)
+        self.setWindowFlags(Qt.Window)
+        self.setAttribute(Qt.WA_OpaquePaintEvent)
+        self.setMouseTracking(False)
+
+        self.builder = builder
+        builder.built.connect(self.on_pyramid_built)
+        builder.request(file_path)
+
+    def on_pyramid_built(self, file_path, directory, error):
+        if self.closed or file_path != self.file_path:
+            return
+        if error:
+            print(f"타일 생성 중 오류 발생: {error}")
+            self.message = "이미지를 불러올 수 없습니다."
+        else:
+            self.pyramid = TilePyramid(directory)
+            self.fit_to_window()
+        self.update()
+
+    def fit_scale(self):
+        if not self.pyramid:
+            return 1.0
+        return min(self.width() / self.pyramid.width, self.height() / self.pyramid.height)
+
+    def fit_to_window(self):
+        if not self.pyramid:
+            return
+        self.fitted = True
+        self.scale = self.fit_scale()
+        # 가운데 정렬: 화면이 사진보다 크면 origin이 음수가 됨
+        self.origin = QPointF((self.pyramid.width - self.width() / self.scale) / 2,
+                              (self.pyramid.height - self.height() / self.scale) / 2)
+        self.update()
+
+    def zoom_at(self, position, factor):
+        if not self.pyramid:
+            return
+        scale = min(MAX_ZOOM, max(self.fit_scale() / 2, self.scale * factor))
+        # 커서 아래의 원본 좌표가 확대 후에도 같은 자리에 있도록 origin을 옮김
+        anchor = self.origin + QPointF(position.x(), position.y()) / self.scale
+        self.scale = scale
+        self.origin = anchor - QPointF(position.x(), position.y()) / scale
+        self.fitted = False
+        self.update()
+
+    def tile(self, level, column, row):
+        key = (level, column, row)
+        image = self.tiles.get(key)
+        if image is not None:
+            self.tiles.move_to_end(key)
+            return image
+        data = self.pyramid.tile_bytes(level, column, row)
+        if data is None:
+            return None
+        image = QImage.fromData(data, 'JPG')
+        self.tiles[key] = image
+        while len(self.tiles) > TILE_VIEWER_MEMORY_TILES:
+            self.tiles.popitem(last=False)
+        return image
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), QColor('black'))
+        if not self.pyramid:
+            painter.setPen(QColor('white'))
+            painter.drawText(self.rect(), Qt.AlignCenter, self.message)
+            return
+
+        painter.setRenderHint(QPainter.SmoothPixmapTransform)
+        level = self.pyramid.level_for_scale(self.scale)
+        level_factor = 2 ** level  # 이 단계의 1픽셀이 덮는 원본 픽셀 수
+        tile_span = self.pyramid.tile_size * level_factor  # 타일 하나가 덮는 원본 픽셀 수
+        left, top = self.origin.x(), self.origin.y()
+        right, bottom = left + self.width() / self.scale, top + self.height() / self.scale
+        info = self.pyramid.levels[level]
+
+        first_column, last_column = max(0, math.floor(left / tile_span)), min(info['columns'] - 1, math.floor(right / tile_span))
+        first_row, last_row = max(0, math.floor(top / tile_span)), min(info['rows'] - 1, math.floor(bottom / tile_span))
+        for row in range(first_row, last_row + 1):
+            for column in range(first_column, last_column + 1):
+                image = self.tile(level, column, row)
+                if image is None or image.isNull():
+                    continue
+                target = QRectF((column * tile_span - left) * self.scale, (row * tile_span - top) * self.scale,
+                                image.width() * level_factor * self.scale, image.height() * level_factor * self.scale)
+                painter.drawImage(target, image)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        if self.fitted:
+            self.fit_to_window()
+
+    def wheelEvent(self, event):
+        steps = event.angleDelta().y() / 120
+        if steps:
+            self.zoom_at(event.pos(), ZOOM_STEP ** steps)
+
+    def mousePressEvent(self, event):
+        if event.button() == Qt.LeftButton:
+            self.drag_position = event.pos()
+
+    def mouseMoveEvent(self, event):
+        if self.drag_position is not None and self.pyramid:
+            delta = event.pos() - self.drag_position
+            self.drag_position = event.pos()
+            self.origin -= QPointF(delta.x(), delta.y()) / self.scale
+            self.fitted = False
+            self.update()
+
+    def mouseReleaseEvent(self, event):
+        self.drag_position = None
+
+    def mouseDoubleClickEvent(self, event):
+        self.fit_to_window()
+
+    def keyPressEvent(self, event):
+        center = self.rect().center()
+        if event.key() == Qt.Key_Escape:
+            self.close()
+        elif event.key() in (Qt.Key_Plus, Qt.Key_Equal):
+            self.zoom_at(center, ZOOM_STEP)
+        elif event.key() == Qt.Key_Minus:
+            self.zoom_at(center, 1 / ZOOM_STEP)
+        elif event.key() == Qt.Key_0:
+            self.fit_to_window()
+        else:
+            super().keyPressEvent(event)
+
+    def closeEvent(self, event):
+        if not self.closed:
+            self.builder.built.disconnect(self.on_pyramid_built)
+        self.closed = True
+        self.tiles.clear()
+        if self.pyramid:
+            self.pyramid.close()
+            self.pyramid = None
+        super().closeEvent(event)
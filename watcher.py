@@ -0,0 +1,133 @@
+import os
+from PyQt5.QtCore import QObject, QFileSystemWatcher, QTimer, QRunnable, QThreadPool, pyqtSignal
+from scanner import LibraryScanner
+from metadata import extract_missing_metadata
+from config import RESOURCES_DIR, WATCH_DEBOUNCE_MS, WATCH_POLL_INTERVAL_MS, WATCH_FORCE_POLLING
+
+
+class _WatchSignals(QObject):
+    finished = pyqtSignal(object)  # 변경된 카테고리 이름 집합
+
+
+class _ScanTask(QRunnable):
+    def __init__(self, db, signals, directories):
+        super().__init__()
+        self.db = db
+        self.signals = signals
+        self.directories = directories
+
+    def run(self):
+        changed_categories = set()
+        try:
+            result = LibraryScanner(self.db).scan(self.directories)
+            if result.added or result.changed:
+                extract_missing_metadata(self.db)
+            if result:
+                names = {category_id: name for name, category_id in self.db.get_category_ids().items()}
+                changed_categories = {names[category_id] for category_id in result.category_ids
+                                      if category_id in names}
+        except Exception as e:
+            print(f"폴더 변경 반영 중 오류 발생: {e}")
+        finally:
+            self.db.release_connection()
+        self.signals.finished.emit(changed_categories)
+
+
+class LibraryWatcher(QObject):
+    library_changed = pyqtSignal(object)  # 변경된 카테고리 이름 집합
+
+    def __init__(self, db, resources_dir=RESOURCES_DIR, parent=None):
+        super().__init__(parent)
+        self.db = db
+        self.resources_dir = resources_dir
+        self.dirty = set()
+        self.scanning = False
+        self.directory_mtimes = {}
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(1)
+        self.signals = _WatchSignals()
+        self.signals.finished.connect(self._on_scan_finished)
+
+        # 알림이 연달아 와도 마지막 변경 후 한 번만 스캔하도록 디바운스
+        self.debounce_timer = QTimer(self)
+        self.debounce_timer.setSingleShot(True)
+        self.debounce_timer.setInterval(WATCH_DEBOUNCE_MS)
+        self.debounce_timer.timeout.connect(self._flush)
+
+        self.poll_timer = QTimer(self)
+        self.poll_timer.setInterval(WATCH_POLL_INTERVAL_MS)
+        self.poll_timer.timeout.connect(self._poll)
+
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.directoryChanged.connect(self._on_directory_changed)
+
+    def watched_directories(self):
+        # 사용자가 직접 파일을 넣고 빼는 카테고리 폴더만 감시함
+        # 저장소(STORE_DIR_NAME)는 가져오기로만 바뀌고 가져오기가 끝나면 목록을 새로 고치므로 감시하지 않으며,
+        # 저장소 파일의 변경/누락은 전체 재스캔(cli rescan)에서만 검사됨 (프로그램 시작 시에는 재스캔하지 않음)
+        directories = [self.resources_dir]
+        directories.extend(os.path.join(self.resources_dir, name) for name in self.db.get_categories())
+        return [os.path.normpath(directory) for directory in directories if os.path.isdir(directory)]
+
+    def refresh(self):
+        # 카테고리가 추가/삭제되면 감시 대상 폴더 목록을 다시 맞춤
+        directories = self.watched_directories()
+        watched = self.watcher.directories()
+        if watched:
+            self.watcher.removePaths(watched)
+        failed = self.watcher.addPaths(directories) if directories and not WATCH_FORCE_POLLING else directories
+        # 알림을 등록할 수 없는 폴더는 수정 시각 폴링으로 감시
+        self.directory_mtimes = {directory: self._directory_mtime(directory) for directory in failed}
+        if self.directory_mtimes:
+            self.poll_timer.start()
+        else:
+            self.poll_timer.stop()
+
+    def stop(self):
+        self.debounce_timer.stop()
+        self.poll_timer.stop()
+        watched = self.watcher.directories()
+        if watched:
+            self.watcher.removePaths(watched)
+        self.pool.waitForDone()
+
+    @staticmethod
+    def _directory_mtime(directory):
+        try:
+            return os.stat(directory).st_mtime_ns
+        except OSError:
+            return None
+
+    def _poll(self):
+        for directory, mtime in list(self.directory_mtimes.items()):
+            current = self._directory_mtime(directory)
+            if current != mtime:
+                self.directory_mtimes[directory] = current
+                self._on_directory_changed(directory)
+
+    def _on_directory_changed(self, path):
+        self.dirty.add(os.path.normpath(path))
+        self.debounce_timer.start()
+
+    def _flush(self):
+        if self.scanning:
+            # 이전 스캔이 끝나면 _on_scan_finished에서 다시 시도
+            return
+        if os.path.normpath(self.resources_dir) in self.dirty:
+            # 카테고리 폴더가 새로 생겼을 수 있으므로 감시 목록을 갱신하고 하위 폴더도 검사
+            self.dirty.discard(os.path.normpath(self.resources_dir))
+            self.refresh()
+            self.dirty.update(directory for directory in self.watched_directories()
+                              if directory != os.path.normpath(self.resources_dir))
+        if not self.dirty:
+            return
+        directories, self.dirty = self.dirty, set()
+        self.scanning = True
+        self.pool.start(_ScanTask(self.db, self.signals, directories))
+
+    def _on_scan_finished(self, changed_categories):
+        self.scanning = False
+        if changed_categories:
+            self.library_changed.emit(changed_categories)
+        if self.dirty:
+            self.debounce_timer.start()